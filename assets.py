@@ -0,0 +1,192 @@
+"""Asset loading with display-format conversion and an on-disk scale cache.
+
+``AssetManager`` is the one place images, fonts and backgrounds come from:
+
+* every surface is ``convert()``-ed (or ``convert_alpha()``-ed when it has
+  per-pixel alpha) so blits never pay for a pixel-format conversion;
+* images scaled to a resolution-specific size are cached as raw pixels in
+  ``CACHE_DIR``, keyed by the source file's hash and the target size, so the
+  next start skips decoding and scaling;
+* the resolved system-font paths are cached there too, so fonts load without
+  a system font scan;
+* level backgrounds load lazily, and the next one is prefetched on a
+  background thread.
+
+It also keeps a log of where startup time went (``report_startup()``).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pygame
+
+CACHE_DIR  = ".asset_cache"
+FONT_INDEX = "fonts.json"
+
+
+class AssetManager:
+    def __init__(self, cache_dir=CACHE_DIR, t0=None):
+        self.cache_dir = cache_dir
+        self.t0        = time.perf_counter() if t0 is None else t0
+        self.timings   = []          # (label, seconds)
+        self.reported  = False
+        self._hashes   = {}
+        self._fonts    = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            self.cache_dir = None    # read-only install: work uncached
+
+    # ── Timing ────────────────────────────────────────────────────────────────
+    def _timed(self, label, start):
+        self.timings.append((label, time.perf_counter() - start))
+
+    def report_startup(self):
+        # Call once the first frame is on screen
+        if self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - self.t0
+        parts = {}
+        for label, secs in self.timings:
+            kind = label.split(":", 1)[0]
+            parts[kind] = parts.get(kind, 0.0) + secs
+        detail = ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in parts.items())
+        print(f"Startup: {total * 1000:.0f} ms to first frame ({detail})")
+
+    # ── Disk cache ────────────────────────────────────────────────────────────
+    def _source_hash(self, path):
+        digest = self._hashes.get(path)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = self._hashes[path] = hashlib.sha1(f.read()).hexdigest()[:16]
+        return digest
+
+    def _cache_path(self, path, size, fmt):
+        if self.cache_dir is None:
+            return None
+        name = f"{self._source_hash(path)}_{size[0]}x{size[1]}_{fmt}.raw"
+        return os.path.join(self.cache_dir, name)
+
+    def _load_scaled(self, path, size):
+        # Raw pixels for (path, size), from the cache when possible; returns
+        # an unconverted surface so it is safe to call off the main thread.
+        for fmt in ("RGBA", "RGB"):
+            cached = self._cache_path(path, size, fmt)
+            if cached and os.path.exists(cached):
+                with open(cached, "rb") as f:
+                    return pygame.image.frombytes(f.read(), size, fmt)
+
+        img = pygame.transform.scale(pygame.image.load(path), size)
+        fmt = "RGBA" if img.get_flags() & pygame.SRCALPHA else "RGB"
+        cached = self._cache_path(path, size, fmt)
+        if cached:
+            tmp = f"{cached}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(pygame.image.tobytes(img, fmt))
+                os.replace(tmp, cached)
+            except OSError:
+                pass
+        return img
+
+    # ── Surfaces ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def to_display(surf):
+        if surf.get_flags() & pygame.SRCALPHA:
+            return surf.convert_alpha()
+        return surf.convert()
+
+    def image(self, path, size):
+        start = time.perf_counter()
+        img = self.to_display(self._load_scaled(path, size))
+        self._timed(f"images:{path}", start)
+        return img
+
+    def backgrounds(self, paths, size):
+        return LazyBackgrounds(self, paths, size)
+
+    # ── Fonts ─────────────────────────────────────────────────────────────────
+    def _font_index(self):
+        if self._fonts is None:
+            self._fonts = {}
+            if self.cache_dir:
+                try:
+                    with open(os.path.join(self.cache_dir, FONT_INDEX)) as f:
+                        self._fonts = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        return self._fonts
+
+    def font(self, name, size, bold=False):
+        # Same result as SysFont(name, size, bold), but the name → file lookup
+        # is remembered across runs so only the first start scans fonts.
+        start = time.perf_counter()
+        index = self._font_index()
+        key   = f"{name}:{int(bold)}"
+        entry = index.get(key)
+        if entry is None or (entry[0] and not os.path.exists(entry[0])):
+            path = pygame.font.match_font(name, bold=bold)
+            # SysFont fakes bold when there is no bold face on disk
+            fake_bold = bold and path == pygame.font.match_font(name)
+            entry = index[key] = [path, fake_bold]
+            if self.cache_dir:
+                try:
+                    with open(os.path.join(self.cache_dir, FONT_INDEX), "w") as f:
+                        json.dump(index, f)
+                except OSError:
+                    pass
+
+        path, fake_bold = entry
+        font = pygame.font.Font(path, size)
+        if fake_bold or (bold and path is None):
+            font.set_bold(True)
+        self._timed(f"fonts:{key}:{size}", start)
+        return font
+
+
+class LazyBackgrounds:
+    """Level backgrounds scaled to the screen, loaded on first use.
+
+    Indexing returns a display-format surface; each access starts loading
+    the following background on a worker thread so level-ups do not stall.
+    """
+
+    def __init__(self, assets, paths, size):
+        self.assets  = assets
+        self.paths   = list(paths)
+        self.size    = size
+        self.ready   = {}          # index -> converted surface
+        self.pending = {}          # index -> (thread, result list)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, i):
+        surf = self.ready.get(i)
+        if surf is None:
+            surf = self._finish(i)
+            self.prefetch((i + 1) % len(self.paths))
+        return surf
+
+    def prefetch(self, i):
+        if i in self.ready or i in self.pending:
+            return
+        result = []
+        worker = threading.Thread(
+            target=lambda: result.append(self.assets._load_scaled(self.paths[i], self.size)),
+            daemon=True)
+        self.pending[i] = worker, result
+        worker.start()
+
+    def _finish(self, i):
+        start = time.perf_counter()
+        worker, result = self.pending.pop(i, (None, None))
+        if worker is not None:
+            worker.join()
+        raw = result[0] if result else self.assets._load_scaled(self.paths[i], self.size)
+        surf = self.ready[i] = self.assets.to_display(raw)
+        self.assets._timed(f"backgrounds:{self.paths[i]}", start)
+        return surf
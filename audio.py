@@ -0,0 +1,125 @@
+"""Sound effects and music on a fixed channel budget.
+
+``AudioManager`` owns the mixer:
+
+* ``pre_init()`` sets a small output buffer before ``pygame.init()`` opens
+  the device, so effects start within a frame or two of the event;
+* every sound belongs to a category with its own reserved channels, so a
+  burst of catches can never starve explosions (or the other way round);
+  when a category is full its oldest voice is cut;
+* ``play()`` only queues; ``flush()`` plays the queue once per frame, with
+  repeats of the same sound merged into one voice and retriggers closer
+  than ``MIN_GAP`` dropped;
+* music streams from disk through ``pygame.mixer.music``, trying each file
+  in turn, and a missing track or audio device just means silence.
+"""
+import time
+
+import pygame
+
+FREQUENCY = 44100
+SAMPLE    = -16             # signed 16-bit
+STEREO    = 2
+BUFFER    = 512             # samples, ~12 ms at 44.1 kHz (pygame's default is 2048 → 46 ms)
+
+# Reserved mixer channels per category
+CHANNEL_BUDGET = {
+    "catch": 4,
+    "hit":   3,
+}
+MIN_GAP   = 0.03            # seconds before the same sound may start again
+
+
+def pre_init():
+    # Must run before pygame.init(), which opens the audio device
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE, STEREO, BUFFER)
+
+
+class AudioManager:
+    def __init__(self, budget=CHANNEL_BUDGET, min_gap=MIN_GAP):
+        self.min_gap  = min_gap
+        self.sounds   = {}          # name -> (Sound, category, volume)
+        self.groups   = {}          # category -> [Channel]
+        self.started  = {}          # Channel -> start time, for voice stealing
+        self.last     = {}          # name -> last start time
+        self.queue    = set()       # names to start this frame
+
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            self.enabled = False    # no audio device: every call is a no-op
+            return
+        self.enabled = True
+
+        total = sum(budget.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, count in budget.items():
+            self.groups[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+
+    # ── Effects ───────────────────────────────────────────────────────────────
+    def load(self, name, path, category, volume=1.0):
+        if not self.enabled:
+            return
+        if category not in self.groups:
+            raise ValueError(f"unknown sound category: {category}")
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError):
+            print(f"Audio: could not load {path}, playing without it")
+            return
+        self.sounds[name] = sound, category, volume
+
+    def play(self, name):
+        if name in self.sounds:
+            self.queue.add(name)
+
+    def flush(self):
+        # Start this frame's queued sounds; call once per frame
+        if not self.queue:
+            return
+        now = time.perf_counter()
+        for name in self.queue:
+            if now - self.last.get(name, -self.min_gap) < self.min_gap:
+                continue
+            sound, category, volume = self.sounds[name]
+            channel = self._voice(category)
+            channel.set_volume(volume)
+            channel.play(sound)
+            self.started[channel] = self.last[name] = now
+        self.queue.clear()
+
+    def _voice(self, category):
+        # A free channel of the category, else the one playing longest
+        channels = self.groups[category]
+        for ch in channels:
+            if not ch.get_busy():
+                return ch
+        return min(channels, key=lambda ch: self.started.get(ch, 0.0))
+
+    # ── Music ─────────────────────────────────────────────────────────────────
+    def music(self, paths, volume=0.5):
+        if not self.enabled:
+            return
+        for path in paths:
+            try:
+                pygame.mixer.music.load(path)
+            except (pygame.error, FileNotFoundError):
+                continue
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+            return
+
+    # ── Focus ─────────────────────────────────────────────────────────────────
+    def pause(self):
+        if self.enabled:
+            pygame.mixer.pause()
+            pygame.mixer.music.pause()
+
+    def resume(self):
+        if self.enabled:
+            pygame.mixer.unpause()
+            pygame.mixer.music.unpause()
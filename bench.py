@@ -0,0 +1,260 @@
+"""Reproducible performance benchmarks for the real game code.
+
+Runs ``catch-the-object.py`` headless (``SDL_VIDEODRIVER=dummy``) and drives
+its ``GameSession`` through scripted stress scenarios, one simulation tick
+per frame with a fixed seed, so runs are comparable between commits:
+
+    steady_level1   greedy autoplay, level 1 forever
+    max_level       spawn rate at its floor, top object speed
+    objects_1000    1,000 falling objects on screen at all times
+    particles_10k   10,000 live particles, as after long combo chains
+    hud_churn       score, combo and lives change every frame
+
+Per scenario it reports mean/p95/p99 frame time for the whole frame and each
+profiler phase, plus memory allocated while running (``tracemalloc``, in a
+separate pass so it does not skew the timings)::
+
+    python bench.py --out baseline.json
+    python bench.py --baseline baseline.json --threshold 10
+    python bench.py --compare baseline.json current.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+import engine
+from profiler import FrameProfiler, PHASES
+
+SEED     = 1234
+WARMUP   = 60
+PERCENTILES = (95, 99)
+NOISE_FLOOR_MS = 0.05     # phase means below this are never flagged
+
+
+def load_game():
+    # The game script has a hyphen in its name, so import it by path
+    os.chdir(HERE)
+    spec = importlib.util.spec_from_file_location("catch_the_object",
+                                                  os.path.join(HERE, "catch-the-object.py"))
+    game = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(game)
+    return game
+
+# ── Scenarios ─────────────────────────────────────────────────────────────────
+# Each returns (session, before_frame) where before_frame(i) adjusts the state
+# and returns that frame's inputs.
+ENDLESS = engine.DEFAULT_DIFFICULTY._replace(points_per_level=10**9)
+
+def keep_alive(state):
+    state.lives = max(state.lives, engine.START_LIVES)
+
+def steady_level1(game):
+    session = game.GameSession(0, seed=SEED, difficulty=ENDLESS)
+    def before_frame(i):
+        keep_alive(session.state)
+        return engine.greedy_policy(session.state)
+    return session, before_frame
+
+def max_level(game):
+    session = game.GameSession(0, seed=SEED)
+    diff = session.state.difficulty
+    floor_level = -(-(diff.spawn_start - diff.spawn_min) // diff.spawn_per_level)
+    session.state.score = floor_level * diff.points_per_level
+    def before_frame(i):
+        keep_alive(session.state)
+        return engine.greedy_policy(session.state)
+    return session, before_frame
+
+def objects_1000(game):
+    session = game.GameSession(0, seed=SEED, difficulty=ENDLESS)
+    state = session.state
+    rng = random.Random(SEED)
+    def before_frame(i):
+        keep_alive(state)
+        objects = state.falling_objects
+        while len(objects) < 1000:
+            objects.spawn(rng.randint(0, state.width - engine.OBJ_SIZE),
+                          rng.randint(-engine.OBJ_SIZE, state.height - engine.OBJ_SIZE),
+                          rng.uniform(2, 6), rng.randrange(len(engine.KINDS)))
+        return engine.greedy_policy(state)
+    return session, before_frame
+
+def particles_10k(game):
+    session = game.GameSession(0, seed=SEED, difficulty=ENDLESS, particle_cap=10_000)
+    state, particles = session.state, session.particles
+    rng = random.Random(SEED)
+    colors = (game.GOLD, game.GREEN, game.WHITE, game.RED)
+    def before_frame(i):
+        keep_alive(state)
+        state.combo = 12
+        while len(particles) < particles.capacity:
+            particles.emit(rng.randint(0, game.WIDTH), rng.randint(0, game.HEIGHT),
+                           colors[rng.randrange(len(colors))], 30)
+        return engine.NO_INPUT
+    return session, before_frame
+
+def hud_churn(game):
+    session = game.GameSession(0, seed=SEED, difficulty=ENDLESS)
+    state = session.state
+    def before_frame(i):
+        state.score = i
+        state.combo = i % 12
+        state.lives = 1 + i % engine.MAX_LIVES
+        return engine.NO_INPUT
+    return session, before_frame
+
+SCENARIOS = {
+    "steady_level1": steady_level1,
+    "max_level":     max_level,
+    "objects_1000":  objects_1000,
+    "particles_10k": particles_10k,
+    "hud_churn":     hud_churn,
+}
+
+# ── Running ───────────────────────────────────────────────────────────────────
+def drive(game, session, before_frame, frames, start=0):
+    prof = game.profiler
+    for i in range(start, start + frames):
+        prof.begin()
+        inputs = before_frame(i)
+        prof.lap("events")
+        session.frame(engine.SIM_DT, inputs)
+
+def _stats(ms):
+    out = {"mean": float(ms.mean())}
+    for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+        out[f"p{p}"] = float(v)
+    return out
+
+def run_scenario(game, name, frames):
+    # Timing pass
+    game.profiler = FrameProfiler(size=frames, enabled=False)
+    session, before_frame = SCENARIOS[name](game)
+    drive(game, session, before_frame, WARMUP)
+    game.profiler = prof = FrameProfiler(size=frames, enabled=True)
+    drive(game, session, before_frame, frames, WARMUP)
+
+    total  = prof._ordered(prof.total) * 1000
+    phases = prof._ordered(prof.phases) * 1000
+    result = {
+        "frames": frames,
+        "frame_ms": _stats(total),
+        "phases_ms": {p: _stats(phases[:, i]) for i, p in enumerate(PHASES)},
+        "objects": len(session.state.falling_objects),
+        "particles": len(session.particles),
+    }
+
+    # Allocation pass, on a fresh session so caches warm the same way
+    game.profiler = FrameProfiler(size=frames, enabled=False)
+    session, before_frame = SCENARIOS[name](game)
+    drive(game, session, before_frame, WARMUP)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    drive(game, session, before_frame, frames, WARMUP)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["alloc_kb"] = {"net": (current - base) / 1024, "peak": (peak - base) / 1024}
+    return result
+
+def run(names, frames):
+    game = load_game()
+    results = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "resolution": [game.WIDTH, game.HEIGHT],
+            "quality": game.QUALITY,
+            "seed": SEED,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        r = results["scenarios"][name] = run_scenario(game, name, frames)
+        f = r["frame_ms"]
+        print(f"{name:<14} mean {f['mean']:7.3f}  p95 {f['p95']:7.3f}  p99 {f['p99']:7.3f} ms"
+              f"   alloc peak {r['alloc_kb']['peak']:8.1f} KiB"
+              f"   ({r['objects']} objects, {r['particles']} particles)")
+        slowest = sorted(r["phases_ms"].items(), key=lambda kv: -kv[1]["mean"])[:3]
+        print(" " * 15 + "  ".join(f"{p} {s['mean']:.3f}" for p, s in slowest))
+    return results
+
+# ── Comparing ─────────────────────────────────────────────────────────────────
+def compare(old, new, threshold):
+    """Print changes between two result sets; returns the list of regressions."""
+    regressions = []
+    for name, n in new["scenarios"].items():
+        o = old["scenarios"].get(name)
+        if o is None:
+            print(f"{name}: not in baseline")
+            continue
+        rows = [("frame", o["frame_ms"], n["frame_ms"])]
+        rows += [(p, o["phases_ms"][p], n["phases_ms"][p])
+                 for p in n["phases_ms"] if p in o["phases_ms"]]
+        for label, os_, ns in rows:
+            for stat in ("mean", *(f"p{p}" for p in PERCENTILES)):
+                before, after = os_[stat], ns[stat]
+                if label != "frame" and (stat != "mean" or after < NOISE_FLOOR_MS):
+                    continue
+                change = (after - before) / before * 100 if before else 0.0
+                flag = change > threshold
+                if flag:
+                    regressions.append((name, label, stat, before, after, change))
+                if label == "frame" or flag:
+                    print(f"{name:<14} {label:<11} {stat:<5} {before:8.3f} → {after:8.3f} ms "
+                          f"({change:+6.1f}%){'  REGRESSION' if flag else ''}")
+    print(f"\n{len(regressions)} regression(s) above {threshold:g}%")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game under stress scenarios.")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS),
+                        default=list(SCENARIOS), help="scenarios to run (default: all)")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--out", help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="compare this run against a saved JSON baseline")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="only compare two saved result files")
+    parser.add_argument("--threshold", type=float, default=10,
+                        help="percent slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        return 1 if compare(old, new, args.threshold) else 0
+
+    results = run(args.scenario, args.frames)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            old = json.load(f)
+        print()
+        return 1 if compare(old, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,66 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import pygame
 import random
 import sys
 import os
 import math
+import atexit
+
+import numpy as np
+
+import engine
+from particles import ParticlePool
+from render import Renderer, TextCache
+from profiler import FrameProfiler, ProfilerOverlay
+from assets import AssetManager
+from replay import Recorder
+import audio
+from engine import BASE_BASKET_W, BASKET_H, OBJ_SIZE
 
 # ── Init ────────────────────────────────────────────────────────────────────
+audio.pre_init()
 pygame.init()
-pygame.mixer.init()
+sound = audio.AudioManager()
+
+# The game world is always engine.WORLD_W x WORLD_H. QUALITY picks the size
+# it is drawn at; SDL then scales that surface to the window in one step
+# (pygame.SCALED), so a 4K display costs no more to fill than a 720p one.
+QUALITY_PRESETS = {
+    "low":    (960, 540),
+    "medium": (1280, 720),
+    "high":   (1920, 1080),
+    "native": None,             # largest 16:9 area of the desktop
+}
+QUALITY = os.environ.get("CATCH_QUALITY", "medium")
+
+def render_size(quality, desktop):
+    size = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["medium"])
+    if size is None:
+        dw, dh = desktop
+        w = min(dw, dh * engine.WORLD_W // engine.WORLD_H)
+        size = (w, w * engine.WORLD_H // engine.WORLD_W)
+    return size
 
 info = pygame.display.Info()
-WIDTH, HEIGHT = info.current_w, info.current_h
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+DESKTOP = (info.current_w, info.current_h)
+WIDTH, HEIGHT = render_size(QUALITY, DESKTOP)
+# Always a window, whatever the quality; SCALED only sizes and scales it
+try:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED)
+except pygame.error:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))   # no renderer: unscaled window
 pygame.display.set_caption("Catch the Falling Objects")
+
+# World units → render pixels
+SCALE = WIDTH / engine.WORLD_W
+
+def px(v):
+    return round(v * SCALE)
+
 clock = pygame.time.Clock()
+assets = AssetManager(t0=STARTUP_T0)
 
 # ── Colors ───────────────────────────────────────────────────────────────────
 WHITE   = (255, 255, 255)
@@ -25,40 +73,23 @@ PURPLE  = (150,  50, 220)
 ORANGE  = (255, 140,   0)
 
 # ── Fonts ────────────────────────────────────────────────────────────────────
-FONT_BIG   = pygame.font.SysFont("segoeui", 56, bold=True)
-FONT_MED   = pygame.font.SysFont("segoeui", 38, bold=True)
-FONT_SMALL = pygame.font.SysFont("segoeui", 28)
-
-# ── Basket ────────────────────────────────────────────────────────────────────
-BASE_BASKET_W, BASKET_H = 120, 55
-BASKET_SPEED = 10
-
-# ── Object sizes ─────────────────────────────────────────────────────────────
-OBJ_SIZE = 52
-
-# ── Object type definitions ───────────────────────────────────────────────────
-# Each type: (image_key, points, is_bad, power_up)
-OBJECT_TYPES = {
-    "apple":  dict(points=1,  bad=False, power=None,          weight=50),
-    "golden": dict(points=3,  bad=False, power="double",      weight=15),
-    "heart":  dict(points=0,  bad=False, power="extra_life",  weight=10),
-    "wand":   dict(points=0,  bad=False, power="wide_basket", weight=8),
-    "bomb":   dict(points=0,  bad=True,  power=None,          weight=17),
-}
+FONT_BIG   = assets.font("segoeui", px(56), bold=True)
+FONT_MED   = assets.font("segoeui", px(38), bold=True)
+FONT_SMALL = assets.font("segoeui", px(28))
+FONT_MONO  = assets.font("monospace", max(12, px(16)))
 
 # ── Load assets ───────────────────────────────────────────────────────────────
-def load_img(path, size):
-    img = pygame.image.load(path)
-    return pygame.transform.scale(img, size)
+OBJ_PX = px(OBJ_SIZE)
 
-basket_img     = load_img("basket.png",   (BASE_BASKET_W, BASKET_H))
-apple_img      = load_img("apple.png",    (OBJ_SIZE, OBJ_SIZE))
-bomb_img       = load_img("bomb.png",     (OBJ_SIZE, OBJ_SIZE))
-game_over_img  = load_img("gameover.png", (480, 180))
+basket_img      = assets.image("basket.png",   (px(BASE_BASKET_W), px(BASKET_H)))
+wide_basket_img = assets.image("basket.png",   (px(2 * BASE_BASKET_W), px(BASKET_H)))
+apple_img       = assets.image("apple.png",    (OBJ_PX, OBJ_PX))
+bomb_img        = assets.image("bomb.png",     (OBJ_PX, OBJ_PX))
+game_over_img   = assets.image("gameover.png", (px(480), px(180)))
 
 # Golden apple: tint the apple image yellow
 golden_img = apple_img.copy()
-golden_surf = pygame.Surface((OBJ_SIZE, OBJ_SIZE), pygame.SRCALPHA)
+golden_surf = pygame.Surface((OBJ_PX, OBJ_PX), pygame.SRCALPHA)
 golden_surf.fill((255, 200, 0, 100))
 golden_img.blit(golden_surf, (0, 0))
 
@@ -86,6 +117,10 @@ for i in range(5):
 pygame.draw.polygon(wand_img, PURPLE, star_points)
 pygame.draw.polygon(wand_img, WHITE,  star_points, 2)
 
+heart_img = pygame.transform.smoothscale(heart_img, (OBJ_PX, OBJ_PX)).convert_alpha()
+wand_img  = pygame.transform.smoothscale(wand_img,  (OBJ_PX, OBJ_PX)).convert_alpha()
+
+# Sprites by name; each kind in spawns.json picks one with its "image" key
 OBJ_IMAGES = {
     "apple":  apple_img,
     "golden": golden_img,
@@ -93,21 +128,36 @@ OBJ_IMAGES = {
     "wand":   wand_img,
     "bomb":   bomb_img,
 }
+for t in engine.TEMPLATES:
+    if t.image not in OBJ_IMAGES:
+        raise ValueError(f"kind {t.name!r}: unknown image {t.image!r}")
+KIND_IMAGES    = [OBJ_IMAGES[t.image] for t in engine.TEMPLATES]     # by kind code
+KIND_PARTICLES = {t.name: t.particle for t in engine.TEMPLATES}
 
-# Background images
-backgrounds = []
-for i in range(1, 6):
-    bg = pygame.transform.scale(pygame.image.load(f"bg{i}.png"), (WIDTH, HEIGHT))
-    backgrounds.append(bg)
+# Background images: loaded on first use, the next level's prefetched
+backgrounds = assets.backgrounds([f"bg{i}.png" for i in range(1, 6)], (WIDTH, HEIGHT))
+backgrounds.prefetch(0)
 
 # Sounds
-catch_sound     = pygame.mixer.Sound("catch.wav")
-explosion_sound = pygame.mixer.Sound("explosion.wav")
-pygame.mixer.music.load("background.mp3")
-pygame.mixer.music.play(-1)
-pygame.mixer.music.set_volume(0.5)
+sound.load(engine.EV_CATCH, "catch.wav",     "catch")
+sound.load(engine.EV_HIT,   "explosion.wav", "hit")
+sound.music(["background.ogg", "background.mp3"])
 
 HIGH_SCORE_FILE = "highscore.txt"
+PARTICLE_CAP    = 4000      # bursts are trimmed past this many live particles
+DIRTY_RECTS     = True      # redraw only changed regions instead of flipping
+RENDER_FPS      = 60        # render rate cap; 0 = uncapped (sim stays at engine.SIM_HZ)
+MAX_FRAME_TIME  = 0.25      # longest stall the simulation catches up on, in seconds
+REPLAY_FILE     = "last_game.ctr"   # inputs of the latest game, see replay.py
+MENU_FPS        = 15        # the menu only animates a pulse and twinkles
+IDLE_WAIT_MS    = 1000      # event.wait() timeout while nothing animates
+PROFILE_KEY     = pygame.K_F3
+PROFILE_OUT     = os.environ.get("CATCH_PROFILE")   # .csv or .json, written on exit
+
+# Off unless CATCH_PROFILE is set or the overlay is toggled with F3
+profiler = FrameProfiler(enabled=bool(PROFILE_OUT))
+if PROFILE_OUT:
+    atexit.register(profiler.dump, PROFILE_OUT)
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 def load_high_score():
@@ -122,226 +172,268 @@ def save_high_score(score):
     with open(HIGH_SCORE_FILE, "w") as f:
         f.write(str(score))
 
+text_cache = TextCache()
+
 def draw_text_shadow(surf, text, font, color, pos, shadow_color=(0,0,0), offset=2):
-    shadow = font.render(text, True, shadow_color)
-    surf.blit(shadow, (pos[0]+offset, pos[1]+offset))
-    rendered = font.render(text, True, color)
-    surf.blit(rendered, pos)
-
-def weighted_choice(types_dict):
-    keys   = list(types_dict.keys())
-    weights = [types_dict[k]["weight"] for k in keys]
-    return random.choices(keys, weights=weights, k=1)[0]
-
-# ── Particle system ───────────────────────────────────────────────────────────
-class Particle:
-    def __init__(self, x, y, color):
-        self.x, self.y = x, y
-        self.color = color
-        self.vx = random.uniform(-4, 4)
-        self.vy = random.uniform(-6, -1)
-        self.life = random.randint(20, 40)
-        self.max_life = self.life
-        self.radius = random.randint(3, 7)
-
-    def update(self):
-        self.x  += self.vx
-        self.y  += self.vy
-        self.vy += 0.25          # gravity
-        self.life -= 1
-
-    def draw(self, surf):
-        alpha = int(255 * self.life / self.max_life)
-        r = max(1, int(self.radius * self.life / self.max_life))
-        col = (*self.color, alpha)
-        s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, col, (r, r), r)
-        surf.blit(s, (int(self.x)-r, int(self.y)-r))
-
-def spawn_particles(particles, x, y, color, count=20):
-    for _ in range(count):
-        particles.append(Particle(x, y, color))
-
-# ── Power-up state ────────────────────────────────────────────────────────────
-class PowerUp:
-    def __init__(self):
-        self.wide_basket_timer = 0
-        self.wide_basket_active = False
+    return surf.blit(text_cache.render(text, font, color, shadow_color, offset), pos)
 
-    def activate(self, kind):
-        if kind == "wide_basket":
-            self.wide_basket_timer = 300   # ~10 seconds at 30fps
-            self.wide_basket_active = True
+# ── Window focus ──────────────────────────────────────────────────────────────
+class WindowState:
+    """Tracks focus/minimize so idle screens can stop drawing and music pauses."""
 
-    def update(self):
-        if self.wide_basket_active:
-            self.wide_basket_timer -= 1
-            if self.wide_basket_timer <= 0:
-                self.wide_basket_active = False
+    def __init__(self):
+        self.focused   = True
+        self.minimized = False
 
     @property
-    def basket_width(self):
-        return BASE_BASKET_W * 2 if self.wide_basket_active else BASE_BASKET_W
+    def active(self):
+        return self.focused and not self.minimized
+
+    def handle(self, event):
+        # Returns True if the event changed whether the window is active
+        was = self.active
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+            self.minimized = False
+        else:
+            return False
+        if self.active == was:
+            return False
+        if self.active:
+            sound.resume()
+        else:
+            sound.pause()
+        return True
+
+window = WindowState()
+
+def wait_events(timeout):
+    # Sleep in the OS until an event arrives or ``timeout`` ms pass, then
+    # drain the queue; returns the events (empty on timeout)
+    first = pygame.event.wait(timeout)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first, *pygame.event.get()]
 
 # ── HUD drawing ───────────────────────────────────────────────────────────────
-def draw_hud(surf, score, lives, high_score, level, combo, power_up):
-    # Semi-transparent panel at top
-    panel = pygame.Surface((WIDTH, 90), pygame.SRCALPHA)
-    panel.fill((0, 0, 0, 120))
-    surf.blit(panel, (0, 0))
-
-    draw_text_shadow(surf, f"Score: {score}",      FONT_MED, WHITE,  (20, 8))
-    draw_text_shadow(surf, f"High: {high_score}",  FONT_MED, GOLD,   (250, 8))
-    draw_text_shadow(surf, f"Level {level+1}",     FONT_MED, CYAN,   (500, 8))
-
-    # Lives as heart icons
-    for i in range(lives):
-        surf.blit(heart_img, (WIDTH - 50 - i * 55, 8))
-
-    # Combo badge
-    if combo > 1:
-        combo_col = GOLD if combo >= 5 else GREEN
-        badge = FONT_BIG.render(f"x{combo} COMBO!", True, combo_col)
-        badge.set_alpha(220)
-        surf.blit(badge, (WIDTH//2 - badge.get_width()//2, 95))
-
-    # Wide basket timer bar
-    if power_up.wide_basket_active:
-        bar_w = int((power_up.wide_basket_timer / 300) * 200)
-        pygame.draw.rect(surf, PURPLE, (20, 95, 200, 12), border_radius=6)
-        pygame.draw.rect(surf, WHITE,  (20, 95, bar_w, 12), border_radius=6)
-        draw_text_shadow(surf, "Wide Basket!", FONT_SMALL, PURPLE, (230, 90))
+HUD_PANEL_H = 90
+
+class HudLayer:
+    """The HUD pre-composited onto one surface.
+
+    The layer is rebuilt only when something it shows changes; otherwise
+    drawing it is a single blit, plus the two rects of the wide-basket timer
+    bar while that runs.
+    """
+
+    def __init__(self, width):
+        height = px(95) + FONT_BIG.get_linesize()
+        self.layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.key   = None
+        self.area  = pygame.Rect(0, 0, width, px(HUD_PANEL_H))
+
+    def draw(self, surf, score, lives, high_score, level, combo, power_up):
+        wide = power_up.wide_basket_active
+        key  = (score, lives, high_score, level, combo, wide)
+        if key != self.key:
+            self.key = key
+            self._compose(score, lives, high_score, level, combo, wide)
+        rect = surf.blit(self.layer, (0, 0), self.area)
+
+        # Wide basket timer bar: shrinks every tick, so it is not part of the layer
+        if wide:
+            bar_w = int((power_up.wide_basket_timer / engine.WIDE_BASKET_FRAMES) * 200)
+            pygame.draw.rect(surf, PURPLE, (px(20), px(95), px(200), px(12)), border_radius=px(6))
+            pygame.draw.rect(surf, WHITE,  (px(20), px(95), px(bar_w), px(12)), border_radius=px(6))
+        return rect
+
+    def _compose(self, score, lives, high_score, level, combo, wide):
+        layer = self.layer
+        width = layer.get_width()
+        layer.fill((0, 0, 0, 0))
+
+        # Semi-transparent panel at top
+        layer.fill((0, 0, 0, 120), (0, 0, width, px(HUD_PANEL_H)))
+
+        draw_text_shadow(layer, f"Score: {score}",      FONT_MED, WHITE,  (px(20),  px(8)))
+        draw_text_shadow(layer, f"High: {high_score}",  FONT_MED, GOLD,   (px(250), px(8)))
+        draw_text_shadow(layer, f"Level {level+1}",     FONT_MED, CYAN,   (px(500), px(8)))
+
+        # Lives as heart icons
+        for i in range(lives):
+            layer.blit(heart_img, (width - px(50 + i * 55), px(8)))
+
+        bottom = px(HUD_PANEL_H)
+
+        # Combo badge
+        if combo > 1:
+            combo_col = GOLD if combo >= 5 else GREEN
+            badge = text_cache.render(f"x{combo} COMBO!", FONT_BIG, combo_col)
+            badge.set_alpha(220)
+            r = layer.blit(badge, (width//2 - badge.get_width()//2, px(95)))
+            badge.set_alpha(None)
+            bottom = max(bottom, r.bottom)
+
+        # Wide basket label; draw() adds the timer bar beside it
+        if wide:
+            r = draw_text_shadow(layer, "Wide Basket!", FONT_SMALL, PURPLE, (px(230), px(90)))
+            bottom = max(bottom, r.bottom)
+
+        self.area = pygame.Rect(0, 0, width, bottom)
 
 # ── Game loop ─────────────────────────────────────────────────────────────────
-def game_loop(high_score):
-    power_up = PowerUp()
-    basket_w = power_up.basket_width
-    basket = pygame.Rect(WIDTH//2 - basket_w//2, HEIGHT - 90, basket_w, BASKET_H)
+def read_inputs():
+    keys = pygame.key.get_pressed()
+    return engine.Inputs(keys[pygame.K_LEFT], keys[pygame.K_RIGHT])
+
+def handle_step_events(events, particles):
+    for ev, kind, cx, cy in events:
+        cx, cy = cx * SCALE, cy * SCALE
+        sound.play(ev)
+        particles.emit(cx, cy, KIND_PARTICLES[kind], 30 if ev == engine.EV_HIT else 18)
+
+def draw_objects(renderer, objects, alpha=1.0):
+    # One blits() call for every object, grouped by image
+    n = objects.n
+    if n == 0:
+        return
+    xs    = (objects.x[:n] * SCALE).astype(int)
+    ys    = (objects.interpolated_y(alpha) * SCALE).astype(int)
+    kinds = objects.kind[:n]
+    batch = []
+    for code, img in enumerate(KIND_IMAGES):
+        sel = kinds == code
+        if sel.any():
+            batch.extend((img, pos) for pos in zip(xs[sel].tolist(), ys[sel].tolist()))
+    renderer.blits(batch)
+
+class GameSession:
+    """One game: the engine state plus everything drawn or played around it.
+
+    ``frame()`` advances the fixed-timestep simulation by real elapsed time
+    and draws one frame. game_loop() feeds it the keyboard; bench.py drives
+    it with scripted inputs.
+    """
+
+    def __init__(self, high_score, seed=None, difficulty=engine.DEFAULT_DIFFICULTY,
+                 particle_cap=PARTICLE_CAP):
+        state = self.state = engine.GameState(engine.WORLD_W, engine.WORLD_H, seed, difficulty)
+        self.high_score  = high_score
+        self.recorder    = Recorder(state)
+        self.particles   = ParticlePool(particle_cap, seed=engine.stream_seed(state.seed, "particles"))
+        self.shake_rng   = engine.make_rng(state.seed, "shake")
+        self.renderer    = Renderer(screen, dirty=DIRTY_RECTS)
+        self.hud         = HudLayer(WIDTH)
+        self.overlay     = ProfilerOverlay(FONT_MONO)
+        self.show_prof   = False
+        self.offset      = (0, 0)
+        self.accumulator = 0.0
+
+    def frame(self, dt, inputs):
+        state, particles, renderer = self.state, self.particles, self.renderer
+
+        # Fixed-timestep simulation: run as many ticks as real time allows,
+        # however fast or slow frames are being drawn
+        self.accumulator += min(dt, MAX_FRAME_TIME)
+        while self.accumulator >= engine.SIM_DT and not state.game_over:
+            self.accumulator -= engine.SIM_DT
+            self.recorder.record(inputs)
+            handle_step_events(engine.step(state, inputs, profiler), particles)
+            particles.update()
+            profiler.lap("particles")
+        sound.flush()
+        profiler.lap("audio")
+        alpha = self.accumulator / engine.SIM_DT
+
+        # Screen shake: a fresh offset every rendered frame, not every tick
+        shaking = state.shake_timer > 0
+        self.offset = ((px(self.shake_rng.randint(-6, 6)) if shaking else 0),
+                       (px(self.shake_rng.randint(-4, 4)) if shaking else 0))
+
+        # ── Draw ──────────────────────────────────────────────────────────────
+        level    = state.level
+        bg_image = backgrounds[level % len(backgrounds)]
+        renderer.begin(bg_image, self.offset)
+        profiler.lap("background")
+
+        # Basket: both widths are scaled once at load
+        basket = state.basket
+        b_img  = basket_img if basket.width == BASE_BASKET_W else wide_basket_img
+        renderer.blit(b_img, (px(state.basket_x(alpha)), px(basket.y)))
+
+        draw_objects(renderer, state.falling_objects, alpha)
+
+        particles.draw(screen, alpha)
+        renderer.mark(particles.bounds())
+        profiler.lap("sprites")
+
+        renderer.mark(self.hud.draw(screen, state.score, state.lives, self.high_score, level,
+                                    state.combo, state.power_up))
+        if self.show_prof:
+            renderer.mark(self.overlay.draw(screen, profiler, (px(20), HEIGHT - px(260))))
+        profiler.lap("hud")
 
-    falling_objects = []   # list of [rect, type_key, speed]
-    particles       = []
-    score       = 0
-    lives       = 3
-    combo       = 0
-    shake_timer = 0
+        renderer.present()
+        profiler.lap("present")
+        profiler.end(len(state.falling_objects), len(particles))
 
-    spawn_timer = 0
+def game_loop(high_score):
+    session = GameSession(high_score)
+    state   = session.state
+    clock.tick()
 
     while True:
+        dt = clock.tick(RENDER_FPS) / 1000
+        profiler.begin()
+
         for event in pygame.event.get():
+            window.handle(event)
             if event.type == pygame.QUIT:
+                session.recorder.save(REPLAY_FILE, state)
                 pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
+                    session.recorder.save(REPLAY_FILE, state)
                     pygame.quit(); sys.exit()
+                if event.key == PROFILE_KEY:
+                    session.show_prof = not session.show_prof
+                    profiler.enabled = session.show_prof or bool(PROFILE_OUT)
 
-        # Level & difficulty
-        level        = score // 20
-        bg_image     = backgrounds[level % len(backgrounds)]
-        object_speed = 5 + level * 2.5
-        spawn_rate   = max(6, 28 - level * 2)   # frames between spawns
-
-        # Move basket
-        keys = pygame.key.get_pressed()
-        basket_w = power_up.basket_width
-        basket.width = basket_w
-        if keys[pygame.K_LEFT]  and basket.left  > 0:     basket.x -= BASKET_SPEED
-        if keys[pygame.K_RIGHT] and basket.right < WIDTH:  basket.x += BASKET_SPEED
-
-        power_up.update()
-
-        # Spawn
-        spawn_timer += 1
-        if spawn_timer >= spawn_rate:
-            spawn_timer = 0
-            x      = random.randint(0, WIDTH - OBJ_SIZE)
-            kind   = weighted_choice(OBJECT_TYPES)
-            rect   = pygame.Rect(x, -OBJ_SIZE, OBJ_SIZE, OBJ_SIZE)
-            spd    = object_speed * random.uniform(0.85, 1.15)
-            falling_objects.append([rect, kind, spd])
-
-        # Move & collide
-        for obj in falling_objects[:]:
-            rect, kind, spd = obj
-            rect.y += spd
-            info_d = OBJECT_TYPES[kind]
-
-            if rect.colliderect(basket):
-                cx, cy = rect.centerx, rect.centery
-                if info_d["bad"]:
-                    lives -= 1
-                    combo  = 0
-                    shake_timer = 12
-                    explosion_sound.play()
-                    spawn_particles(particles, cx, cy, RED, 30)
-                else:
-                    pts = info_d["points"]
-                    if pts == 0 and info_d["power"] is None:
-                        pts = 1
-                    combo += 1
-                    multiplier = 1 + (combo // 3)
-                    score += pts * multiplier
-                    catch_sound.play()
-                    p_col = GOLD if kind == "golden" else (WHITE if kind in ("heart","wand") else GREEN)
-                    spawn_particles(particles, cx, cy, p_col, 18)
-                    if info_d["power"] == "extra_life":
-                        lives = min(lives + 1, 7)
-                    elif info_d["power"]:
-                        power_up.activate(info_d["power"])
-                falling_objects.remove(obj)
-
-            elif rect.y > HEIGHT:
-                if not info_d["bad"]:
-                    combo = 0        # missed a good object → reset combo
-                falling_objects.remove(obj)
-
-        # Update particles
-        for p in particles[:]:
-            p.update()
-            if p.life <= 0:
-                particles.remove(p)
-
-        # Screen shake offset
-        ox = random.randint(-6, 6) if shake_timer > 0 else 0
-        oy = random.randint(-4, 4) if shake_timer > 0 else 0
-        if shake_timer > 0: shake_timer -= 1
-
-        # ── Draw ──────────────────────────────────────────────────────────────
-        screen.blit(bg_image, (ox, oy))
-
-        # Basket (resize image on the fly if needed)
-        b_img = pygame.transform.scale(basket_img, (basket_w, BASKET_H))
-        screen.blit(b_img, basket)
+        # Unfocused or minimized: freeze the game and sleep until it is back
+        if not window.active:
+            paused_screen(session)
+            clock.tick()
+            continue
 
-        for rect, kind, _ in falling_objects:
-            screen.blit(OBJ_IMAGES[kind], rect)
+        inputs = read_inputs()
+        profiler.lap("events")
 
-        for p in particles:
-            p.draw(screen)
-
-        draw_hud(screen, score, lives, high_score, level, combo, power_up)
+        session.frame(dt, inputs)
 
         # Game Over
-        if lives <= 0:
+        if state.game_over:
+            score = state.score
             if score > high_score:
                 high_score = score
                 save_high_score(high_score)
+            session.recorder.save(REPLAY_FILE, state)
 
-            # Dim overlay
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-
-            screen.blit(game_over_img, (WIDTH//2 - 240, HEIGHT//2 - 130))
+            screen.blit(game_over_layer((WIDTH, HEIGHT)), (0, 0))
             draw_text_shadow(screen, f"Final Score: {score}", FONT_MED, GOLD,
-                             (WIDTH//2 - 150, HEIGHT//2 + 70))
-            draw_text_shadow(screen, "R  -  Restart     Q  -  Quit", FONT_SMALL, WHITE,
-                             (WIDTH//2 - 190, HEIGHT//2 + 125))
+                             (WIDTH//2 - px(150), HEIGHT//2 + px(70)))
             pygame.display.flip()
 
-            waiting = True
-            while waiting:
-                for event in pygame.event.get():
+            # Nothing animates here: block until there is input
+            while True:
+                for event in wait_events(IDLE_WAIT_MS):
+                    window.handle(event)
+                    if event.type == pygame.WINDOWEXPOSED:
+                        pygame.display.flip()
                     if event.type == pygame.QUIT:
                         pygame.quit(); sys.exit()
                     if event.type == pygame.KEYDOWN:
@@ -350,36 +442,44 @@ def game_loop(high_score):
                         if event.key == pygame.K_q:
                             pygame.quit(); sys.exit()
 
-        pygame.display.flip()
-        clock.tick(30)
-
-# ── Start screen ──────────────────────────────────────────────────────────────
-def start_screen(high_score):
-    bg_angle = 0
-    while True:
-        # Animated gradient background
-        for y in range(HEIGHT):
-            frac = y / HEIGHT
-            r = int(10 + 30*frac)
-            g = int(10 + 20*frac)
-            b = int(40 + 80*frac)
-            pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-
-        # Floating title particles effect (simple twinkles)
-        for _ in range(3):
-            tx = random.randint(0, WIDTH)
-            ty = random.randint(0, HEIGHT)
-            pygame.draw.circle(screen, (255, 255, 255, 80), (tx, ty), random.randint(1, 3))
+def paused_screen(session):
+    draw_text_shadow(screen, "Paused", FONT_BIG, WHITE, (WIDTH//2 - px(90), HEIGHT//2 - px(40)))
+    pygame.display.flip()
+    while not window.active:
+        for event in wait_events(IDLE_WAIT_MS):
+            window.handle(event)
+            if event.type == pygame.QUIT:
+                session.recorder.save(REPLAY_FILE, session.state)
+                pygame.quit(); sys.exit()
+    session.renderer.invalidate()
+
+# ── Static screen layers ──────────────────────────────────────────────────────
+# Built once per resolution; the menu and game-over loops only blit them.
+PULSE_STEPS = 32
+_layers = {}
+
+def _gradient(size):
+    w, h = size
+    frac = np.arange(h) / h
+    col  = np.stack([10 + 30*frac, 10 + 20*frac, 40 + 80*frac], axis=-1).astype(np.uint8)
+    strip = pygame.surfarray.make_surface(col[np.newaxis, :, :])
+    return pygame.transform.scale(strip, size)
+
+def menu_layers(size):
+    key = ("menu", size)
+    if key not in _layers:
+        w, h = size
+        bg = _gradient(size)
 
         # Title
         title = FONT_BIG.render("🎯  Catch the Falling Objects", True, GOLD)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//2 - 180))
+        bg.blit(title, (w//2 - title.get_width()//2, h//2 - px(180)))
 
         # Instruction box
-        box = pygame.Surface((500, 240), pygame.SRCALPHA)
+        box = pygame.Surface((px(500), px(240)), pygame.SRCALPHA)
         box.fill((0, 0, 0, 140))
-        pygame.draw.rect(box, GOLD, box.get_rect(), 2, border_radius=12)
-        screen.blit(box, (WIDTH//2 - 250, HEIGHT//2 - 60))
+        pygame.draw.rect(box, GOLD, box.get_rect(), 2, border_radius=px(12))
+        bg.blit(box, (w//2 - px(250), h//2 - px(60)))
 
         lines = [
             ("← → to move basket",     WHITE,  -20),
@@ -390,23 +490,71 @@ def start_screen(high_score):
         ]
         for txt, col, dy in lines:
             t = FONT_SMALL.render(txt, True, col)
-            screen.blit(t, (WIDTH//2 - t.get_width()//2, HEIGHT//2 - 50 + dy))
-
-        draw_text_shadow(screen, f"🏆  High Score:  {high_score}", FONT_MED, GOLD,
-                         (WIDTH//2 - 180, HEIGHT//2 + 210))
-
-        # Pulsing start prompt
-        pulse = abs(math.sin(pygame.time.get_ticks() / 500))
-        col   = (int(50 + 205*pulse), int(205*pulse), int(50 + 100*pulse))
-        draw_text_shadow(screen, "Press  SPACE  to Start", FONT_MED, col,
-                         (WIDTH//2 - 210, HEIGHT//2 + 270))
-        draw_text_shadow(screen, "Q  -  Quit", FONT_SMALL, (180, 180, 180),
-                         (WIDTH//2 - 80, HEIGHT//2 + 320))
+            bg.blit(t, (w//2 - t.get_width()//2, h//2 + px(dy - 50)))
+
+        draw_text_shadow(bg, "Q  -  Quit", FONT_SMALL, (180, 180, 180),
+                         (w//2 - px(80), h//2 + px(320)))
+
+        # Pulsing start prompt, one pre-rendered frame per pulse step
+        prompts = []
+        for i in range(PULSE_STEPS):
+            pulse = i / (PULSE_STEPS - 1)
+            col   = (int(50 + 205*pulse), int(205*pulse), int(50 + 100*pulse))
+            prompts.append(text_cache.render("Press  SPACE  to Start", FONT_MED, col, BLACK))
+
+        _layers[key] = bg, prompts
+    return _layers[key]
+
+def game_over_layer(size):
+    key = ("game_over", size)
+    if key not in _layers:
+        w, h = size
+        # Dim overlay
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        layer.fill((0, 0, 0, 160))
+        layer.blit(game_over_img, (w//2 - px(240), h//2 - px(130)))
+        draw_text_shadow(layer, "R  -  Restart     Q  -  Quit", FONT_SMALL, WHITE,
+                         (w//2 - px(190), h//2 + px(125)))
+        _layers[key] = layer
+    return _layers[key]
 
-        pygame.display.flip()
-        clock.tick(30)
+# ── Start screen ──────────────────────────────────────────────────────────────
+def start_screen(high_score):
+    base, prompts = menu_layers((WIDTH, HEIGHT))
+    bg = base.copy()
+    draw_text_shadow(bg, f"🏆  High Score:  {high_score}", FONT_MED, GOLD,
+                     (WIDTH//2 - px(180), HEIGHT//2 + px(210)))
+    renderer = Renderer(screen, dirty=DIRTY_RECTS)
+    frame_ms   = 1000 // MENU_FPS
+    next_frame = 0
 
-        for event in pygame.event.get():
+    while True:
+        now = pygame.time.get_ticks()
+        if window.active and now >= next_frame:
+            next_frame = now + frame_ms
+            renderer.begin(bg)
+
+            # Floating title particles effect (simple twinkles)
+            for _ in range(3):
+                tx = random.randint(0, WIDTH)
+                ty = random.randint(0, HEIGHT)
+                renderer.mark(pygame.draw.circle(screen, (255, 255, 255, 80), (tx, ty),
+                                                 random.randint(1, 3)))
+
+            # Pulsing start prompt
+            pulse = abs(math.sin(now / 500))
+            renderer.blit(prompts[round(pulse * (PULSE_STEPS - 1))],
+                          (WIDTH//2 - px(210), HEIGHT//2 + px(270)))
+
+            renderer.present()
+            assets.report_startup()
+
+        # Sleep until the next animation frame (or much longer when the
+        # window is inactive) unless input arrives first
+        timeout = max(1, next_frame - pygame.time.get_ticks()) if window.active else IDLE_WAIT_MS
+        for event in wait_events(timeout):
+            if window.handle(event) or event.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN:
@@ -416,9 +564,10 @@ def start_screen(high_score):
                     pygame.quit(); sys.exit()
 
 # ── Entry point ───────────────────────────────────────────────────────────────
-high_score = load_high_score()
-while True:
-    start_screen(high_score)
-    restart, high_score = game_loop(high_score)
-    if not restart:
-        break
+if __name__ == "__main__":
+    high_score = load_high_score()
+    while True:
+        start_screen(high_score)
+        restart, high_score = game_loop(high_score)
+        if not restart:
+            break
@@ -0,0 +1,583 @@
+"""Headless gameplay core for Catch the Falling Objects.
+
+Everything that decides what happens in a frame lives here: the basket,
+falling objects, power-ups, score, lives, combo and the spawn timer. Nothing
+in this module touches the display, the mixer or the clock, so a game can be
+stepped as fast as the CPU allows (tests, tuning, bots) and the interactive
+script only has to turn inputs into ``step()`` calls and draw the result.
+"""
+import collections
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+# ── World ─────────────────────────────────────────────────────────────────────
+# Gameplay always happens in this fixed playfield, whatever size the game is
+# drawn at; renderers scale world coordinates to their own surface.
+WORLD_W, WORLD_H = 1280, 720
+
+# ── Basket ────────────────────────────────────────────────────────────────────
+BASE_BASKET_W, BASKET_H = 120, 55
+BASKET_SPEED = 10
+BASKET_BOTTOM_GAP = 90          # basket top sits this far above the bottom edge
+
+# ── Object sizes ─────────────────────────────────────────────────────────────
+OBJ_SIZE = 52
+
+# ── Object kinds and spawn waves ──────────────────────────────────────────────
+# Both are data in spawns.json, so a new kind or level only needs a config
+# edit (plus a sprite). Each kind compiles to a flat KindTemplate; ``image``
+# and ``particle`` are for renderers and never read here. A Wave applies from
+# its ``level`` up to the next wave's: ``scale`` multiplies the spawn weights
+# (in KINDS order) and ``burst`` is how many objects drop per spawn. Bad
+# values are rejected here, at import, rather than at the level-up that
+# would first use them.
+SPAWN_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spawns.json")
+
+KindTemplate = namedtuple("KindTemplate", "name points bad power weight image particle")
+Wave = namedtuple("Wave", "level scale burst")
+
+POWERS = (None, "extra_life", "wide_basket", "double")
+
+def _is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+def _load_kind(name, k):
+    where = f"kind {name!r}"
+    points = k.get("points", 0)
+    if not _is_int(points):
+        raise ValueError(f"{where}: points must be an integer")
+    bad = k.get("bad", False)
+    if not isinstance(bad, bool):
+        raise ValueError(f"{where}: bad must be true or false")
+    power = k.get("power")
+    if power not in POWERS:
+        raise ValueError(f"{where}: unknown power {power!r}")
+    weight = k.get("weight")
+    if not (_is_int(weight) or isinstance(weight, float)):
+        raise ValueError(f"{where}: weight must be a number")
+    image = k.get("image", name)
+    if not isinstance(image, str):
+        raise ValueError(f"{where}: image must be a sprite name")
+    particle = k.get("particle", (255, 255, 255))
+    if (not isinstance(particle, (list, tuple)) or len(particle) != 3
+            or not all(_is_int(c) and 0 <= c <= 255 for c in particle)):
+        raise ValueError(f"{where}: particle must be 3 integers in 0-255")
+    return KindTemplate(name, points, bad, power, weight, image, tuple(particle))
+
+def load_spawn_config(path=SPAWN_CONFIG):
+    with open(path) as f:
+        config = json.load(f)
+    templates = tuple(_load_kind(name, k) for name, k in config["kinds"].items())
+    names = [t.name for t in templates]
+    base  = [t.weight for t in templates]
+    if any(w < 0 for w in base) or sum(base) <= 0:
+        raise ValueError("kind weights must be >= 0 with a positive total")
+    waves = []
+    for w in config.get("waves", []):
+        level = w.get("level")
+        where = f"wave at level {level}"
+        if not _is_int(level) or level < 0:
+            raise ValueError(f"{where}: level must be an integer >= 0")
+        if any(other.level == level for other in waves):
+            raise ValueError(f"{where}: level is used by another wave")
+        scale = w.get("scale", {})
+        unknown = set(scale) - set(names)
+        if unknown:
+            raise ValueError(f"{where}: unknown kind(s) {', '.join(sorted(unknown))}")
+        factors = tuple(float(scale.get(n, 1)) for n in names)
+        if any(f < 0 for f in factors):
+            raise ValueError(f"{where}: scale factors must be >= 0")
+        if sum(b * f for b, f in zip(base, factors)) <= 0:
+            raise ValueError(f"{where}: scaled weights must have a positive total")
+        burst = w.get("burst", 1)
+        if not _is_int(burst) or burst < 1:
+            raise ValueError(f"{where}: burst must be an integer >= 1")
+        waves.append(Wave(level, factors, burst))
+    return templates, tuple(sorted(waves))
+
+TEMPLATES, WAVES = load_spawn_config()
+
+# Kinds are stored as small integer codes in the object store; TEMPLATES and
+# these tables are indexed by code, so the collision pass does no dict lookups.
+KINDS    = tuple(t.name for t in TEMPLATES)
+KIND_BAD = np.array([t.bad for t in TEMPLATES], dtype=bool)
+
+# ── Simulation clock ──────────────────────────────────────────────────────────
+# step() always advances exactly one tick of SIM_DT seconds; every per-frame
+# speed and frame count in this module is per tick. Renderers run their own
+# clock and call step() as many times as real time requires.
+SIM_HZ = 30
+SIM_DT = 1 / SIM_HZ
+
+# ── Rules ─────────────────────────────────────────────────────────────────────
+START_LIVES        = 3
+MAX_LIVES          = 7
+POINTS_PER_LEVEL   = 20
+WIDE_BASKET_FRAMES = round(10 * SIM_HZ)
+SHAKE_FRAMES       = round(0.4 * SIM_HZ)
+
+# ── Step events ───────────────────────────────────────────────────────────────
+# step() reports what happened as (event, kind, x, y) tuples so the renderer
+# can play sounds and spawn particles without the engine knowing about either.
+EV_CATCH = "catch"
+EV_HIT   = "hit"
+
+Inputs = namedtuple("Inputs", "left right")
+NO_INPUT = Inputs(False, False)
+
+# ── Random streams ────────────────────────────────────────────────────────────
+# One game seed fans out into an independent stream per subsystem, so adding
+# or removing random draws in one place (say, more particles) never shifts
+# what another subsystem sees. "spawn" is the only stream gameplay reads;
+# "policy" feeds scripted players, so a seeded headless game is repeatable.
+RNG_STREAMS = ("spawn", "particles", "shake", "policy")
+
+def new_seed():
+    return random.randrange(2**63)
+
+def stream_seed(seed, stream):
+    digest = hashlib.sha256(f"{seed}:{stream}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def make_rng(seed, stream):
+    return random.Random(stream_seed(seed, stream))
+
+
+# ── Difficulty curve ──────────────────────────────────────────────────────────
+# Every knob of the difficulty curve in one place, so tools like tune.py can
+# try alternatives with Difficulty._replace(...) without touching step().
+# ``weights`` is the base spawn weight of each kind, in KINDS order, and
+# ``waves`` the per-level Wave schedule on top of it.
+Difficulty = namedtuple("Difficulty", [
+    "base_speed", "speed_per_level",
+    "spawn_start", "spawn_per_level", "spawn_min",
+    "points_per_level", "weights", "waves",
+])
+DEFAULT_DIFFICULTY = Difficulty(
+    base_speed=5, speed_per_level=2.5,
+    spawn_start=28, spawn_per_level=2, spawn_min=6,
+    points_per_level=POINTS_PER_LEVEL,
+    weights=tuple(t.weight for t in TEMPLATES),
+    waves=WAVES,
+)
+
+def with_weights(difficulty, **weights):
+    # e.g. with_weights(DEFAULT_DIFFICULTY, bomb=25)
+    return difficulty._replace(weights=tuple(weights.get(k, w)
+                                             for k, w in zip(KINDS, difficulty.weights)))
+
+def rules_digest(difficulty=DEFAULT_DIFFICULTY):
+    # Short fingerprint of the kind rules and difficulty curve (waves included)
+    # step() plays by; sprites and particle colours are left out
+    rules = ([t[:5] for t in TEMPLATES], difficulty)
+    return hashlib.sha1(repr(rules).encode()).digest()[:8]
+
+def level_for_score(score, difficulty=DEFAULT_DIFFICULTY):
+    return score // difficulty.points_per_level
+
+def object_speed(level, difficulty=DEFAULT_DIFFICULTY):
+    return difficulty.base_speed + level * difficulty.speed_per_level
+
+def spawn_rate(level, difficulty=DEFAULT_DIFFICULTY):
+    # ticks between spawns
+    return max(difficulty.spawn_min, difficulty.spawn_start - level * difficulty.spawn_per_level)
+
+# ── Spawn scheduling ──────────────────────────────────────────────────────────
+SPAWN_BATCH  = 64             # spawns rolled ahead at a time
+SPEED_JITTER = (0.85, 1.15)   # per-object factor on the level's object speed
+
+class AliasTable:
+    """Walker's alias method: a weighted pick from one uniform draw.
+
+    Built once per weight vector in O(n); ``sample()`` maps an array of
+    uniforms in [0, 1) to kind codes with no search or cumulative sums.
+    """
+
+    def __init__(self, weights):
+        w = np.asarray(weights, dtype=np.float64)
+        n = len(w)
+        if n == 0 or w.sum() <= 0:
+            raise ValueError("spawn weights must have a positive total")
+        scaled = w * n / w.sum()
+        self.prob  = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s], self.alias[s] = scaled[s], l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+
+    def sample(self, u):
+        k = u * len(self.prob)
+        i = k.astype(np.intp)
+        return np.where(k - i < self.prob[i], i, self.alias[i])
+
+
+class SpawnScheduler:
+    """Spawns for the current wave, pre-rolled SPAWN_BATCH at a time.
+
+    Every wave's weights are compiled to an AliasTable up front, so weights
+    that cannot be sampled fail when the game starts. Batches of (x, kind
+    code, speed factor) rows are drawn with a few vectorized calls on the
+    game's "spawn" stream. Entering a new wave drops the rest of the batch,
+    so the rows always match the weights in force.
+    """
+
+    def __init__(self, seed, width, difficulty):
+        self.rng     = np.random.default_rng(stream_seed(seed, "spawn"))
+        self.max_x   = width - OBJ_SIZE
+        self.base    = np.asarray(difficulty.weights, dtype=np.float64)
+        self.waves   = difficulty.waves
+        self.levels  = [w.level for w in self.waves]
+        self.tables  = {-1: AliasTable(self.base)}      # wave index -> AliasTable; -1 = base
+        for i, w in enumerate(self.waves):
+            self.tables[i] = AliasTable(self.base * w.scale)
+        self.wave    = None
+        self.batch   = []
+        self.pos     = 0
+
+    def _wave_index(self, level):
+        # Last wave starting at or below ``level``; -1 = base weights
+        i = -1
+        for j, start in enumerate(self.levels):
+            if start > level:
+                break
+            i = j
+        return i
+
+    def _refill(self):
+        rng, n = self.rng, SPAWN_BATCH
+        xs      = rng.integers(0, self.max_x, n, endpoint=True)
+        codes   = self.tables[self.wave].sample(rng.random(n))
+        factors = rng.uniform(*SPEED_JITTER, n)
+        self.batch = list(zip(xs.tolist(), codes.tolist(), factors.tolist()))
+        self.pos   = 0
+
+    def take(self, level):
+        """Rows for one spawn tick at ``level``: one per object in the burst."""
+        wave = self._wave_index(level)
+        if wave != self.wave:
+            self.wave  = wave
+            self.batch = []
+            self.pos   = 0
+        burst = self.waves[wave].burst if wave >= 0 else 1
+        rows = []
+        for _ in range(burst):
+            if self.pos == len(self.batch):
+                self._refill()
+            rows.append(self.batch[self.pos])
+            self.pos += 1
+        return rows
+
+# ── Falling-object store ──────────────────────────────────────────────────────
+class ObjectStore:
+    """Structure-of-arrays storage for falling objects.
+
+    Positions, speeds and kind codes live in parallel NumPy arrays; only the
+    first ``n`` slots are live. Movement and the basket test are one array
+    operation each, and removals are a single masked compaction. ``prev_y``
+    holds each object's position before the last tick for interpolation.
+    """
+
+    def __init__(self, capacity=64):
+        self.n     = 0
+        self.x     = np.empty(capacity, dtype=np.float32)
+        self.y     = np.empty(capacity, dtype=np.float32)
+        self.prev_y = np.empty(capacity, dtype=np.float32)
+        self.speed = np.empty(capacity, dtype=np.float32)
+        self.kind  = np.empty(capacity, dtype=np.int8)
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self):
+        cap = len(self.x) * 2
+        for name in ("x", "y", "prev_y", "speed", "kind"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, speed, kind_code):
+        if self.n == len(self.x):
+            self._grow()
+        i = self.n
+        self.x[i], self.y[i], self.speed[i], self.kind[i] = x, y, speed, kind_code
+        self.prev_y[i] = y
+        self.n = i + 1
+
+    def advance(self):
+        n = self.n
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] += self.speed[:n]
+
+    def overlaps(self, rect):
+        # Same edge rules as Rect.colliderect
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        return ((x < rect.right) & (x + OBJ_SIZE > rect.left) &
+                (y < rect.bottom) & (y + OBJ_SIZE > rect.top))
+
+    def compact(self, keep):
+        k = int(np.count_nonzero(keep))
+        n = self.n
+        for arr in (self.x, self.y, self.prev_y, self.speed, self.kind):
+            arr[:k] = arr[:n][keep]
+        self.n = k
+
+    def interpolated_y(self, alpha):
+        n = self.n
+        prev = self.prev_y[:n]
+        return prev + (self.y[:n] - prev) * alpha
+
+# ── Power-up state ────────────────────────────────────────────────────────────
+class PowerUp:
+    def __init__(self):
+        self.wide_basket_timer = 0
+        self.wide_basket_active = False
+
+    def activate(self, kind):
+        if kind == "wide_basket":
+            self.wide_basket_timer = WIDE_BASKET_FRAMES
+            self.wide_basket_active = True
+
+    def update(self):
+        if self.wide_basket_active:
+            self.wide_basket_timer -= 1
+            if self.wide_basket_timer <= 0:
+                self.wide_basket_active = False
+
+    @property
+    def basket_width(self):
+        return BASE_BASKET_W * 2 if self.wide_basket_active else BASE_BASKET_W
+
+# ── Game state ────────────────────────────────────────────────────────────────
+class GameState:
+    def __init__(self, width, height, seed=None, difficulty=DEFAULT_DIFFICULTY):
+        self.width, self.height = width, height
+        self.difficulty = difficulty
+        self.seed       = new_seed() if seed is None else seed
+        self.spawner    = SpawnScheduler(self.seed, width, difficulty)
+        self.policy_rng = make_rng(self.seed, "policy")     # for scripted players only
+
+        self.power_up = PowerUp()
+        basket_w = self.power_up.basket_width
+        self.basket = pygame.Rect(width//2 - basket_w//2, height - BASKET_BOTTOM_GAP,
+                                  basket_w, BASKET_H)
+        self.prev_basket_x = self.basket.x
+
+        self.falling_objects = ObjectStore()
+        self.score       = 0
+        self.lives       = START_LIVES
+        self.combo       = 0
+        self.shake_timer = 0
+        self.spawn_timer = 0
+        self.frame       = 0
+
+    @property
+    def level(self):
+        return level_for_score(self.score, self.difficulty)
+
+    @property
+    def game_over(self):
+        return self.lives <= 0
+
+    def digest(self):
+        # Fingerprint of everything step() depends on, for replay checks
+        h = hashlib.sha1(struct.pack(
+            "<8q", self.frame, self.score, self.lives, self.combo, self.spawn_timer,
+            self.basket.x, self.basket.width, self.power_up.wide_basket_timer))
+        objects = self.falling_objects
+        n = objects.n
+        for arr in (objects.x, objects.y, objects.speed, objects.kind):
+            h.update(arr[:n].tobytes())
+        return h.digest()
+
+    def basket_x(self, alpha=1.0):
+        # Basket position blended between the last two ticks
+        return self.prev_basket_x + (self.basket.x - self.prev_basket_x) * alpha
+
+
+def step(state, inputs, prof=None):
+    """Advance ``state`` by one tick and return the list of step events.
+
+    ``prof`` is an optional ``profiler.FrameProfiler`` that gets separate
+    laps for movement/spawning and collision resolution.
+    """
+    events = []
+    power_up = state.power_up
+    basket   = state.basket
+
+    if state.shake_timer > 0:
+        state.shake_timer -= 1
+
+    # Level & difficulty
+    diff  = state.difficulty
+    level = state.level
+    speed = object_speed(level, diff)
+    rate  = spawn_rate(level, diff)
+
+    # Move basket
+    state.prev_basket_x = basket.x
+    basket.width = power_up.basket_width
+    if inputs.left  and basket.left  > 0:            basket.x -= BASKET_SPEED
+    if inputs.right and basket.right < state.width:  basket.x += BASKET_SPEED
+
+    power_up.update()
+
+    # Spawn
+    objects = state.falling_objects
+    state.spawn_timer += 1
+    if state.spawn_timer >= rate:
+        state.spawn_timer = 0
+        for x, code, factor in state.spawner.take(level):
+            objects.spawn(x, -OBJ_SIZE, speed * factor, code)
+
+    # Move & collide
+    objects.advance()
+    if prof is not None:
+        prof.lap("simulation")
+    n    = objects.n
+    hit  = objects.overlaps(basket)
+    gone = hit | (objects.y[:n] > state.height)
+    if gone.any():
+        # Resolve in spawn order so combo/score match a per-object pass
+        for i in np.flatnonzero(gone).tolist():
+            tpl = TEMPLATES[objects.kind[i]]
+            if not hit[i]:
+                if not tpl.bad:
+                    state.combo = 0        # missed a good object → reset combo
+                continue
+
+            cx = int(objects.x[i]) + OBJ_SIZE // 2
+            cy = int(objects.y[i]) + OBJ_SIZE // 2
+            if tpl.bad:
+                state.lives -= 1
+                state.combo  = 0
+                state.shake_timer = SHAKE_FRAMES
+                events.append((EV_HIT, tpl.name, cx, cy))
+            else:
+                pts   = tpl.points
+                power = tpl.power
+                if pts == 0 and power is None:
+                    pts = 1
+                state.combo += 1
+                multiplier = 1 + (state.combo // 3)
+                state.score += pts * multiplier
+                events.append((EV_CATCH, tpl.name, cx, cy))
+                if power == "extra_life":
+                    state.lives = min(state.lives + 1, MAX_LIVES)
+                elif power:
+                    power_up.activate(power)
+        objects.compact(~gone)
+
+    state.frame += 1
+    if prof is not None:
+        prof.lap("collision")
+    return events
+
+# ── Headless runs ─────────────────────────────────────────────────────────────
+def random_policy(state):
+    rng = state.policy_rng
+    return Inputs(rng.random() < 0.5, rng.random() < 0.5)
+
+DANGER_TICKS = 8      # bombs this close to landing are dodged before anything else
+
+def greedy_policy(state, ignore=None):
+    """Scripted player: dodge imminent bombs, else chase the next catchable good object.
+
+    Objects flagged in the boolean array ``ignore`` are treated as not there.
+    """
+    objects = state.falling_objects
+    basket  = state.basket
+    centre  = basket.centerx
+    n = objects.n
+    if n == 0:
+        return NO_INPUT
+
+    x     = objects.x[:n] + OBJ_SIZE / 2
+    ticks = (basket.top - (objects.y[:n] + OBJ_SIZE)) / objects.speed[:n]
+    bad   = KIND_BAD[objects.kind[:n]]
+    if ignore is not None:
+        bad = bad & ~ignore
+    reach = np.abs(x - centre) - basket.width / 2
+
+    # Dodge: a bomb about to land over (or next to) the basket
+    danger = bad & (ticks >= -1) & (ticks < DANGER_TICKS) & (reach < OBJ_SIZE)
+    if danger.any():
+        bomb_x = x[danger].mean()
+        go_left = bomb_x >= centre
+        if go_left and basket.left <= 0:
+            go_left = False
+        elif not go_left and basket.right >= state.width:
+            go_left = True
+        return Inputs(go_left, not go_left)
+
+    # Chase: the soonest-landing good object the basket can still get under
+    target = ~bad & (ticks >= 0) & (reach <= ticks * BASKET_SPEED)
+    if not target.any():
+        return NO_INPUT
+    idx = np.flatnonzero(target)
+    tx  = x[idx[np.argmin(ticks[idx])]]
+    if abs(tx - centre) <= BASKET_SPEED / 2:
+        return NO_INPUT
+    return Inputs(tx < centre, tx > centre)
+
+REACTION_TICKS = 6    # ~200 ms at SIM_HZ: a human acts on what they saw this long ago
+MISS_RATE      = 0.2  # chance each bomb goes unnoticed until it is too late
+
+def human_policy(reaction_ticks=REACTION_TICKS, miss_rate=MISS_RATE):
+    """greedy_policy with human limits, for tuning against realistic survival times.
+
+    Inputs are the greedy decision from ``reaction_ticks`` ticks ago, and each
+    bomb is overlooked with probability ``miss_rate`` (drawn once per bomb from
+    ``state.policy_rng``). Returns a new policy; use one per game.
+    """
+    pending = collections.deque()
+    noticed = {}
+
+    def policy(state):
+        objects = state.falling_objects
+        n = objects.n
+        blind = np.zeros(n, dtype=bool)
+        seen = {}
+        for i in np.flatnonzero(KIND_BAD[objects.kind[:n]]):
+            # Objects have no ids; a bomb is keyed by its column and speed
+            key = (int(objects.x[i]), float(objects.speed[i]))
+            if key not in noticed:
+                noticed[key] = state.policy_rng.random() >= miss_rate
+            seen[key] = noticed[key]
+            blind[i] = not noticed[key]
+        noticed.clear()
+        noticed.update(seen)
+        pending.append(greedy_policy(state, ignore=blind))
+        if len(pending) <= reaction_ticks:
+            return NO_INPUT
+        return pending.popleft()
+
+    return policy
+
+def run_headless(width=WORLD_W, height=WORLD_H, seed=None, policy=random_policy, max_frames=None,
+                 difficulty=DEFAULT_DIFFICULTY):
+    state = GameState(width, height, seed, difficulty)
+    while not state.game_over and (max_frames is None or state.frame < max_frames):
+        step(state, policy(state))
+    return state
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    state = run_headless(seed=0, max_frames=100_000)
+    elapsed = time.perf_counter() - start
+    print(f"{state.frame} frames in {elapsed:.2f}s "
+          f"({state.frame / elapsed:,.0f} fps) — score {state.score}, level {state.level + 1}")
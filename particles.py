@@ -0,0 +1,144 @@
+"""Pooled particle bursts for catches and bomb hits.
+
+Particles live in a fixed-capacity structure-of-arrays pool: spawning fills
+free slots, dead particles are recycled by swapping the live tail into their
+slots, and drawing is a single ``Surface.blits()`` of pre-rendered circle
+sprites, so the hot loop never allocates a Surface. ``update()`` runs once
+per simulation tick; ``draw()`` blends each particle between its last two
+positions so bursts move smoothly at any render rate.
+"""
+import numpy as np
+import pygame
+
+GRAVITY       = 0.25
+LIFE_RANGE    = (20, 40)        # frames, inclusive
+RADIUS_RANGE  = (3, 7)          # pixels, inclusive
+ALPHA_BUCKETS = 16              # fade steps kept in the sprite cache
+DEFAULT_CAP   = 4000
+
+
+class SpriteCache:
+    """Circle sprites keyed by (color, radius, alpha bucket).
+
+    Every sprite for a color is rendered the first time that color is used,
+    after which ``key()`` gives its slot in the flat ``sprites`` list.
+    """
+
+    def __init__(self, max_radius=RADIUS_RANGE[1], buckets=ALPHA_BUCKETS):
+        self.max_radius = max_radius
+        self.buckets    = buckets
+        self.colors     = {}      # color -> color index
+        self.sprites    = []      # flat: (color_idx, radius, bucket)
+
+    def color_index(self, color):
+        idx = self.colors.get(color)
+        if idx is None:
+            idx = self.colors[color] = len(self.colors)
+            for r in range(self.max_radius + 1):
+                for b in range(self.buckets):
+                    self.sprites.append(self._render(color, max(1, r), b))
+        return idx
+
+    def _render(self, color, r, bucket):
+        alpha = int(255 * (bucket + 1) / self.buckets)
+        s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*color, alpha), (r, r), r)
+        return s
+
+    def key(self, color_idx, radius, bucket):
+        return (color_idx * (self.max_radius + 1) + radius) * self.buckets + bucket
+
+
+class ParticlePool:
+    def __init__(self, capacity=DEFAULT_CAP, seed=None, sprites=None):
+        self.capacity = capacity
+        self.n        = 0
+        self.rng      = np.random.default_rng(seed)
+        self.sprites  = sprites or SpriteCache()
+
+        self.x        = np.zeros(capacity, dtype=np.float32)
+        self.y        = np.zeros(capacity, dtype=np.float32)
+        self.prev_x   = np.zeros(capacity, dtype=np.float32)
+        self.prev_y   = np.zeros(capacity, dtype=np.float32)
+        self.vx       = np.zeros(capacity, dtype=np.float32)
+        self.vy       = np.zeros(capacity, dtype=np.float32)
+        self.life     = np.zeros(capacity, dtype=np.int16)
+        self.max_life = np.ones(capacity,  dtype=np.int16)
+        self.radius   = np.zeros(capacity, dtype=np.int8)
+        self.color    = np.zeros(capacity, dtype=np.int16)
+
+    def __len__(self):
+        return self.n
+
+    def emit(self, x, y, color, count=20):
+        # Past the cap the burst is trimmed rather than growing the pool
+        count = min(count, self.capacity - self.n)
+        if count <= 0:
+            return
+        s = slice(self.n, self.n + count)
+        rng = self.rng
+        self.x[s]  = self.prev_x[s] = x
+        self.y[s]  = self.prev_y[s] = y
+        self.vx[s] = rng.uniform(-4, 4, count)
+        self.vy[s] = rng.uniform(-6, -1, count)
+        life = rng.integers(LIFE_RANGE[0], LIFE_RANGE[1] + 1, count)
+        self.life[s]     = life
+        self.max_life[s] = life
+        self.radius[s]   = rng.integers(RADIUS_RANGE[0], RADIUS_RANGE[1] + 1, count)
+        self.color[s]    = self.sprites.color_index(color)
+        self.n += count
+
+    def update(self):
+        n = self.n
+        if n == 0:
+            return
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n]  += self.vx[:n]
+        self.y[:n]  += self.vy[:n]
+        self.vy[:n] += GRAVITY
+        self.life[:n] -= 1
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if len(dead) == 0:
+            return
+        # Swap-remove: live particles from the tail fill the holes left in
+        # the surviving prefix, so only len(dead) slots are touched.
+        k      = n - len(dead)
+        holes  = dead[dead < k]
+        movers = np.flatnonzero(self.life[k:n] > 0) + k
+        for arr in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy,
+                    self.life, self.max_life, self.radius, self.color):
+            arr[holes] = arr[movers]
+        self.n = k
+
+    def draw(self, surf, alpha=1.0):
+        # ``alpha`` is how far the renderer is between the last two ticks
+        n = self.n
+        if n == 0:
+            return
+        cache = self.sprites
+        frac   = self.life[:n] / self.max_life[:n]
+        r      = np.maximum(1, (self.radius[:n] * frac).astype(np.int32))
+        bucket = np.minimum(cache.buckets - 1, (frac * cache.buckets).astype(np.int32))
+        keys   = cache.key(self.color[:n].astype(np.int32), r, bucket)
+        x, y   = self.prev_x[:n], self.prev_y[:n]
+        px     = (x + (self.x[:n] - x) * alpha).astype(np.int32) - r
+        py     = (y + (self.y[:n] - y) * alpha).astype(np.int32) - r
+        sprites = cache.sprites
+        surf.blits([(sprites[k], (ax, ay))
+                    for k, ax, ay in zip(keys.tolist(), px.tolist(), py.tolist())],
+                   doreturn=False)
+
+    def bounds(self):
+        # One rect around every live particle at any point between its last
+        # two positions, for dirty-rect renderers
+        n = self.n
+        if n == 0:
+            return None
+        r  = RADIUS_RANGE[1]
+        x0 = int(min(self.x[:n].min(), self.prev_x[:n].min())) - r
+        y0 = int(min(self.y[:n].min(), self.prev_y[:n].min())) - r
+        x1 = int(max(self.x[:n].max(), self.prev_x[:n].max())) + r + 1
+        y1 = int(max(self.y[:n].max(), self.prev_y[:n].max())) + r + 1
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
@@ -0,0 +1,158 @@
+"""Per-frame phase timings for diagnosing stutter.
+
+``FrameProfiler`` splits each frame into the phases in ``PHASES`` with
+``lap()`` calls and keeps the last ``size`` frames in a ring buffer, along
+with the live object and particle counts. Phase times and ``mean_ms`` are
+work done inside a frame; ``fps`` comes from the interval between
+consecutive ``begin()`` calls, so it includes time spent waiting on the
+frame cap. While disabled every call returns
+immediately, so the instrumentation can stay in production builds and be
+switched on with a hotkey or the ``CATCH_PROFILE`` environment variable.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+PHASES = ("events", "simulation", "collision", "particles", "audio",
+          "background", "sprites", "hud", "present")
+PHASE_INDEX = {name: i for i, name in enumerate(PHASES)}
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    def __init__(self, size=900, enabled=False):
+        self.enabled  = enabled
+        self.size     = size
+        self.phases   = np.zeros((size, len(PHASES)), dtype=np.float64)  # seconds
+        self.total    = np.zeros(size, dtype=np.float64)
+        self.interval = np.zeros(size, dtype=np.float64)                # begin → next begin
+        self.counts   = np.zeros((size, 2), dtype=np.int32)              # objects, particles
+        self.index    = 0
+        self.filled   = 0
+
+        self._cur        = np.zeros(len(PHASES), dtype=np.float64)
+        self._start      = self._last = 0.0
+        self._prev_begin = None
+        self._interval   = 0.0
+        self._active     = False
+
+    def begin(self):
+        if not self.enabled:
+            self._prev_begin = None
+            return
+        now = time.perf_counter()
+        self._interval   = now - self._prev_begin if self._prev_begin is not None else 0.0
+        self._prev_begin = self._start = self._last = now
+        self._cur[:] = 0
+        self._active = True
+
+    def lap(self, phase):
+        # Charge the time since the previous lap to ``phase``; may repeat
+        # within a frame (e.g. once per simulation tick).
+        if not self._active:
+            return
+        now = time.perf_counter()
+        self._cur[PHASE_INDEX[phase]] += now - self._last
+        self._last = now
+
+    def end(self, objects=0, particles=0):
+        if not self._active:
+            return
+        self._active = False
+        i = self.index
+        self.phases[i]   = self._cur
+        self.total[i]    = time.perf_counter() - self._start
+        self.interval[i] = self._interval
+        self.counts[i]   = objects, particles
+        self.index  = (i + 1) % self.size
+        self.filled = min(self.filled + 1, self.size)
+
+    def _ordered(self, arr):
+        # Ring contents oldest-first
+        if self.filled < self.size:
+            return arr[:self.filled]
+        return np.concatenate([arr[self.index:], arr[:self.index]])
+
+    def summary(self):
+        if self.filled == 0:
+            return None
+        total = self._ordered(self.total) * 1000
+        phases = self._ordered(self.phases) * 1000
+        counts = self._ordered(self.counts)
+        interval = self._ordered(self.interval)
+        interval = interval[interval > 0]
+        out = {
+            "frames":  int(self.filled),
+            "mean_ms": float(total.mean()),
+            "max_ms":  float(total.max()),
+            "fps":     float(1 / interval.mean()) if len(interval) else 0.0,
+            "phases_ms": {name: float(phases[:, i].mean()) for i, name in enumerate(PHASES)},
+            "objects":   int(counts[-1, 0]),
+            "particles": int(counts[-1, 1]),
+        }
+        for p, v in zip(PERCENTILES, np.percentile(total, PERCENTILES)):
+            out[f"p{p}_ms"] = float(v)
+        return out
+
+    def dump(self, path):
+        if self.filled == 0:
+            return
+        total  = self._ordered(self.total) * 1000
+        phases = self._ordered(self.phases) * 1000
+        counts = self._ordered(self.counts)
+        interval = self._ordered(self.interval) * 1000
+        rows = zip(total.tolist(), interval.tolist(), phases.tolist(), counts.tolist())
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["frame_ms", "interval_ms", *(f"{p}_ms" for p in PHASES),
+                            "objects", "particles"])
+                for t, iv, ph, c in rows:
+                    w.writerow([f"{t:.4f}", f"{iv:.4f}", *(f"{v:.4f}" for v in ph), *c])
+        else:
+            frames = [dict(frame_ms=t, interval_ms=iv, objects=c[0], particles=c[1],
+                           **{f"{p}_ms": v for p, v in zip(PHASES, ph)})
+                      for t, iv, ph, c in rows]
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "frames": frames}, f, indent=1)
+
+
+class ProfilerOverlay:
+    """Text panel with the profiler summary, refreshed a few times a second."""
+
+    def __init__(self, font, refresh=15):
+        self.font    = font
+        self.refresh = refresh
+        self.surf    = None
+        self.age     = 0
+
+    def draw(self, surf, profiler, pos):
+        self.age += 1
+        if self.surf is None or self.age >= self.refresh:
+            self.age  = 0
+            self.surf = self._compose(profiler.summary())
+        return surf.blit(self.surf, pos)
+
+    def _compose(self, s):
+        if s is None:
+            lines = ["profiling…"]
+        else:
+            lines = [
+                f"{s['fps']:.0f} fps   work mean {s['mean_ms']:.2f}  p50 {s['p50_ms']:.2f}  "
+                f"p95 {s['p95_ms']:.2f}  p99 {s['p99_ms']:.2f}  max {s['max_ms']:.2f} ms",
+                f"objects {s['objects']}   particles {s['particles']}",
+            ]
+            lines += [f"{name:<11}{ms:7.3f} ms" for name, ms in s["phases_ms"].items()]
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        w = max(r.get_width() for r in rendered) + 16
+        h = sum(r.get_height() for r in rendered) + 12
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 6
+        for r in rendered:
+            panel.blit(r, (8, y))
+            y += r.get_height()
+        return panel
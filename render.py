@@ -0,0 +1,95 @@
+"""Frame presentation for the game screen.
+
+``Renderer`` sits between the game loop and the display. Every blit goes
+through it so it knows the bounds of everything drawn this frame; in
+dirty-rect mode only those regions (and last frame's) are restored from the
+background and pushed with ``display.update(rects)`` instead of re-blitting
+and flipping the whole screen. ``TextCache`` keeps rendered strings around so
+unchanged labels are not rasterized again every frame.
+"""
+from collections import OrderedDict
+
+import pygame
+
+# Past this share of the screen, one full blit + flip is cheaper than many
+# small restores and a long update list.
+FULL_REDRAW_RATIO = 0.5
+
+
+class Renderer:
+    def __init__(self, screen, dirty=True):
+        self.screen = screen
+        self.dirty  = dirty
+        self.area   = screen.get_width() * screen.get_height()
+        self.bg     = None
+        self.offset = (0, 0)
+        self.prev   = []      # rects drawn last frame
+        self.cur    = []      # rects drawn this frame
+        self.full   = True
+
+    def invalidate(self):
+        # Next frame is a full redraw (after overlays, screen changes, ...)
+        self.bg = None
+
+    def begin(self, bg, offset=(0, 0)):
+        # Background swaps and screen shake move every pixel
+        self.full = (not self.dirty or bg is not self.bg
+                     or offset != (0, 0) or self.offset != (0, 0))
+        self.bg, self.offset = bg, offset
+        if not self.full and sum(r.w * r.h for r in self.prev) > self.area * FULL_REDRAW_RATIO:
+            self.full = True
+
+        if self.full:
+            self.screen.blit(bg, offset)
+        else:
+            self.screen.blits([(bg, r, r) for r in self.prev], doreturn=False)
+
+    def blit(self, surf, pos, area=None):
+        self.cur.append(self.screen.blit(surf, pos, area))
+
+    def blits(self, seq):
+        self.cur.extend(self.screen.blits(seq))
+
+    def mark(self, rect):
+        # For things drawn straight onto the screen (shapes, batched sprites)
+        if rect:
+            self.cur.append(pygame.Rect(rect).clip(self.screen.get_rect()))
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.prev + self.cur)
+        self.prev, self.cur = self.cur, []
+
+
+class TextCache:
+    """LRU cache of rendered text keyed by (text, font, color, shadow).
+
+    With a shadow color the shadow and the text are composited into a single
+    surface, so a cached label costs one blit.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def render(self, text, font, color, shadow=None, offset=2):
+        key = (text, font, color, shadow, offset)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            return surf
+
+        rendered = font.render(text, True, color)
+        if shadow is None:
+            surf = rendered
+        else:
+            w, h = rendered.get_size()
+            surf = pygame.Surface((w + offset, h + offset), pygame.SRCALPHA)
+            surf.blit(font.render(text, True, shadow), (offset, offset))
+            surf.blit(rendered, (0, 0))
+        self.entries[key] = surf
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return surf
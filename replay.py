@@ -0,0 +1,182 @@
+"""Compact input recordings that replay a game exactly.
+
+A game is fully determined by its rules (``spawns.json`` and the difficulty
+curve), its seed, its resolution and the input bits of every tick, so that
+is all a replay stores, the rules as a short fingerprint. The file is a
+fixed header followed by run-length encoded input bits:
+
+    header  <4sHQHHHII8s20s>  magic, version, seed, width, height, sim_hz,
+                              ticks, final score, rules digest,
+                              final state digest
+    body    (bits: u8, run: varint)*   consecutive ticks with the same keys
+
+Replays play back headless, either as fast as possible or paced at the
+simulation rate, and are checked against the recorded score and digest::
+
+    python replay.py last_game.ctr [--realtime]
+"""
+import argparse
+import struct
+import sys
+import time
+
+import engine
+
+MAGIC   = b"CTRP"
+VERSION = 3                 # 2: spawns drawn by engine.SpawnScheduler, 3: rules digest
+PREFIX  = struct.Struct("<4sH")
+HEADER  = struct.Struct("<4sHQHHHII8s20s")
+
+BIT_LEFT, BIT_RIGHT = 1, 2
+
+
+class ReplayError(Exception):
+    pass
+
+
+def input_bits(inputs):
+    return (BIT_LEFT if inputs.left else 0) | (BIT_RIGHT if inputs.right else 0)
+
+def bits_input(bits):
+    return engine.Inputs(bool(bits & BIT_LEFT), bool(bits & BIT_RIGHT))
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay body")
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class Recorder:
+    """Collects one game's per-tick inputs as (bits, run) pairs."""
+
+    def __init__(self, state):
+        self.seed   = state.seed
+        self.size   = (state.width, state.height)
+        self.rules  = engine.rules_digest(state.difficulty)
+        self.runs   = []
+        self.ticks  = 0
+
+    def record(self, inputs):
+        bits = input_bits(inputs)
+        if self.runs and self.runs[-1][0] == bits:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+        self.ticks += 1
+
+    def encode(self, state):
+        body = bytearray()
+        for bits, run in self.runs:
+            body.append(bits)
+            _write_varint(body, run)
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.size[0], self.size[1],
+                             engine.SIM_HZ, self.ticks, state.score, self.rules,
+                             state.digest())
+        return header + bytes(body)
+
+    def save(self, path, state):
+        with open(path, "wb") as f:
+            f.write(self.encode(state))
+
+
+class Replay:
+    def __init__(self, seed, size, sim_hz, ticks, score, rules, digest, runs):
+        self.seed, self.size, self.sim_hz = seed, size, sim_hz
+        self.ticks, self.score, self.digest = ticks, score, digest
+        self.rules = rules
+        self.runs  = runs
+
+    @classmethod
+    def decode(cls, data):
+        if len(data) < PREFIX.size:
+            raise ReplayError("file too short for a replay header")
+        magic, version = PREFIX.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        if len(data) < HEADER.size:
+            raise ReplayError("file too short for a replay header")
+        _, _, seed, w, h, sim_hz, ticks, score, rules, digest = HEADER.unpack_from(data)
+        runs, pos = [], HEADER.size
+        while pos < len(data):
+            bits = data[pos]
+            run, pos = _read_varint(data, pos + 1)
+            runs.append((bits, run))
+        if sum(run for _, run in runs) != ticks:
+            raise ReplayError("replay body does not match its tick count")
+        return cls(seed, (w, h), sim_hz, ticks, score, rules, digest, runs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+    def inputs(self):
+        for bits, run in self.runs:
+            inp = bits_input(bits)
+            for _ in range(run):
+                yield inp
+
+
+def play(replay, realtime=False):
+    """Re-run ``replay`` headless; returns (final state, ok).
+
+    Raises ReplayError when the replay was made under different rules or
+    clock, since it could not play back the same game.
+    """
+    if replay.sim_hz != engine.SIM_HZ:
+        raise ReplayError(f"recorded at {replay.sim_hz} Hz, engine runs at {engine.SIM_HZ} Hz")
+    if replay.rules != engine.rules_digest():
+        raise ReplayError("recorded with different object kinds, spawn waves or difficulty "
+                          "(spawns.json changed?)")
+    state = engine.GameState(*replay.size, seed=replay.seed)
+    next_tick = time.perf_counter()
+    for inp in replay.inputs():
+        engine.step(state, inp)
+        if realtime:
+            next_tick += engine.SIM_DT
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    ok = state.score == replay.score and state.digest() == replay.digest
+    return state, ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify a Catch the Falling Objects replay.")
+    parser.add_argument("path")
+    parser.add_argument("--realtime", action="store_true",
+                        help="pace playback at the simulation rate instead of running flat out")
+    args = parser.parse_args(argv)
+
+    # Exit codes: 0 verified, 1 mismatch, 2 unreadable or not a replay
+    try:
+        replay = Replay.load(args.path)
+        start = time.perf_counter()
+        state, ok = play(replay, args.realtime)
+    except (ReplayError, OSError) as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    print(f"{replay.ticks} ticks, seed {replay.seed}, {replay.size[0]}x{replay.size[1]}: "
+          f"score {state.score} (recorded {replay.score}) in {elapsed:.2f}s — "
+          f"{'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Replay codec round trips: record a headless game, decode it, play it back."""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pytest
+
+import engine
+import replay
+
+
+def record_game(seed, max_frames=5000):
+    state    = engine.GameState(engine.WORLD_W, engine.WORLD_H, seed=seed)
+    recorder = replay.Recorder(state)
+    while not state.game_over and state.frame < max_frames:
+        inputs = engine.greedy_policy(state)
+        recorder.record(inputs)
+        engine.step(state, inputs)
+    return state, recorder.encode(state)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+def test_round_trip_verifies(seed):
+    state, data = record_game(seed)
+    rep = replay.Replay.decode(data)
+    assert (rep.seed, rep.ticks, rep.score) == (seed, state.frame, state.score)
+
+    played, ok = replay.play(rep)
+    assert ok
+    assert played.digest() == state.digest()
+
+
+def test_tampered_input_is_a_mismatch():
+    state, data = record_game(7)
+    body = bytearray(data)
+    first = replay.HEADER.size          # keys of the first run
+    body[first] = replay.BIT_RIGHT if body[first] == replay.BIT_LEFT else replay.BIT_LEFT
+    _, ok = replay.play(replay.Replay.decode(bytes(body)))
+    assert not ok
+
+
+def test_truncated_body_raises():
+    _, data = record_game(3)
+    with pytest.raises(replay.ReplayError):
+        replay.Replay.decode(data[:-1])
+
+
+def test_short_or_foreign_file_raises():
+    _, data = record_game(3)
+    with pytest.raises(replay.ReplayError):
+        replay.Replay.decode(data[:replay.HEADER.size - 1])
+    with pytest.raises(replay.ReplayError):
+        replay.Replay.decode(b"XXXX" + data[4:])
+
+
+def test_cli_exit_codes(tmp_path):
+    _, data = record_game(5)
+    good = tmp_path / "good.ctr"
+    bad  = tmp_path / "bad.ctr"
+    good.write_bytes(data)
+    bad.write_bytes(data[:-1])
+    assert replay.main([str(good)]) == 0
+    assert replay.main([str(bad)]) == 2
+    assert replay.main([str(tmp_path / "missing.ctr")]) == 2
+
+
+def test_changed_rules_raise(monkeypatch, tmp_path):
+    _, data = record_game(4)
+    rep = replay.Replay.decode(data)
+    bomb = engine.KINDS.index("bomb")
+    edited = tuple(t._replace(weight=t.weight + 1) if i == bomb else t
+                   for i, t in enumerate(engine.TEMPLATES))
+    monkeypatch.setattr(engine, "TEMPLATES", edited)
+    with pytest.raises(replay.ReplayError, match="different"):
+        replay.play(rep)
+
+    path = tmp_path / "stale.ctr"
+    path.write_bytes(data)
+    assert replay.main([str(path)]) == 2
+
+
+def test_cosmetic_changes_keep_replays_valid(monkeypatch):
+    _, data = record_game(4)
+    recolored = tuple(t._replace(particle=(0, 0, 0)) for t in engine.TEMPLATES)
+    monkeypatch.setattr(engine, "TEMPLATES", recolored)
+    _, ok = replay.play(replay.Replay.decode(data))
+    assert ok
+
+
+def test_other_difficulty_raises():
+    diff  = engine.with_weights(engine.DEFAULT_DIFFICULTY, bomb=30)
+    state = engine.GameState(engine.WORLD_W, engine.WORLD_H, seed=2, difficulty=diff)
+    data  = replay.Recorder(state).encode(state)
+    with pytest.raises(replay.ReplayError):
+        replay.play(replay.Replay.decode(data))
+
+
+def test_old_version_is_rejected():
+    _, data = record_game(3)
+    old = data[:4] + (2).to_bytes(2, "little") + data[6:]
+    with pytest.raises(replay.ReplayError, match="version 2"):
+        replay.Replay.decode(old)
@@ -0,0 +1,129 @@
+"""Alias-table sampling and the per-level wave switch of the spawn scheduler."""
+import json
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pytest
+
+import engine
+
+DRAWS = 200_000
+
+
+def frequencies(weights, seed=0):
+    table = engine.AliasTable(weights)
+    codes = table.sample(np.random.default_rng(seed).random(DRAWS))
+    return np.bincount(codes, minlength=len(weights)) / DRAWS
+
+
+@pytest.mark.parametrize("weights", [
+    engine.DEFAULT_DIFFICULTY.weights,
+    (1, 0, 0, 0, 0),
+    (0, 0, 0, 0, 1),
+    (0, 3, 0, 1, 0),
+    (1, 1, 1, 1, 1),
+])
+def test_alias_frequencies_match_weights(weights):
+    expected = np.asarray(weights, dtype=float) / sum(weights)
+    got = frequencies(weights)
+    assert np.abs(got - expected).max() < 0.005
+    assert (got[expected == 0] == 0).all()        # zero weight is never drawn
+
+
+def test_alias_rejects_empty_weights():
+    with pytest.raises(ValueError):
+        engine.AliasTable((0, 0, 0))
+
+
+def test_wave_switch_changes_weights_and_burst():
+    kinds = len(engine.KINDS)
+    bomb  = engine.KINDS.index("bomb")
+    only_bombs = tuple(1.0 if i == bomb else 0.0 for i in range(kinds))
+    diff = engine.DEFAULT_DIFFICULTY._replace(waves=(
+        engine.Wave(0, (1.0,) * kinds, 1),
+        engine.Wave(3, only_bombs, 3),
+    ))
+    spawner = engine.SpawnScheduler(seed=1, width=engine.WORLD_W, difficulty=diff)
+
+    early = [row for _ in range(200) for row in spawner.take(2)]
+    assert len(early) == 200
+    assert len({code for _, code, _ in early}) > 1
+
+    late = spawner.take(3)
+    assert len(late) == 3
+    assert {code for _, code, _ in late} == {bomb}     # leftover level-2 rows were dropped
+    for x, _, factor in late:
+        assert 0 <= x <= engine.WORLD_W - engine.OBJ_SIZE
+        assert engine.SPEED_JITTER[0] <= factor <= engine.SPEED_JITTER[1]
+
+
+def test_scheduler_is_deterministic_per_seed():
+    a = engine.SpawnScheduler(9, engine.WORLD_W, engine.DEFAULT_DIFFICULTY)
+    b = engine.SpawnScheduler(9, engine.WORLD_W, engine.DEFAULT_DIFFICULTY)
+    assert [a.take(0) for _ in range(100)] == [b.take(0) for _ in range(100)]
+
+
+def write_config(tmp_path, waves=None, kinds=None):
+    with open(engine.SPAWN_CONFIG) as f:
+        config = json.load(f)
+    if waves is not None:
+        config["waves"] = waves
+    if kinds is not None:
+        config["kinds"].update(kinds)
+    path = tmp_path / "spawns.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+@pytest.mark.parametrize("waves", [
+    [{"level": 2, "scale": {k: 0 for k in engine.KINDS}}],
+    [{"level": 2, "scale": {"bomb": -1}}],
+    [{"level": 2, "burst": 0}],
+    [{"level": 2, "burst": 1.5}],
+    [{"level": 2, "scale": {"pear": 2}}],
+    [{"level": "2"}],
+    [{"level": -2}],
+    [{"level": True}],
+    [{"burst": 2}],
+    [{"level": 2, "burst": 1}, {"level": 2, "burst": 2}],
+])
+def test_bad_waves_fail_at_load(tmp_path, waves):
+    with pytest.raises(ValueError, match="wave at level"):
+        engine.load_spawn_config(write_config(tmp_path, [{"level": 0}] + waves))
+
+
+@pytest.mark.parametrize("kind", [
+    {"points": "3", "weight": 5},
+    {"points": 1.5, "weight": 5},
+    {"bad": 1, "weight": 5},
+    {"power": "wide", "weight": 5},
+    {"weight": "5"},
+    {"weight": True},
+    {"points": 1},
+    {"weight": 5, "particle": "red"},
+    {"weight": 5, "particle": [255, 0]},
+    {"weight": 5, "particle": [255, 0, 256]},
+    {"weight": 5, "particle": [255, 0, 0.5]},
+    {"weight": 5, "image": 3},
+])
+def test_bad_kinds_fail_at_load(tmp_path, kind):
+    with pytest.raises(ValueError, match="kind 'pear'"):
+        engine.load_spawn_config(write_config(tmp_path, kinds={"pear": kind}))
+
+
+def test_shipped_config_loads():
+    templates, waves = engine.load_spawn_config()
+    assert tuple(t.name for t in templates) == engine.KINDS
+    assert all(w.burst >= 1 for w in waves)
+
+
+def test_unsampleable_wave_fails_at_game_start():
+    # Tuned base weights can zero out a wave the config itself allows
+    only_apples = engine.with_weights(engine.DEFAULT_DIFFICULTY,
+                                      **{k: 0 for k in engine.KINDS if k != "apple"})
+    no_apples = tuple(0.0 if k == "apple" else 1.0 for k in engine.KINDS)
+    diff = only_apples._replace(waves=(engine.Wave(3, no_apples, 1),))
+    with pytest.raises(ValueError):
+        engine.SpawnScheduler(1, engine.WORLD_W, diff)
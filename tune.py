@@ -0,0 +1,222 @@
+"""Batch difficulty tuner: many headless games in parallel, one report.
+
+Each candidate difficulty (see ``engine.Difficulty``) is played by a scripted
+policy for a number of seeded games, spread over a ``multiprocessing`` pool.
+The default ``human`` policy (``engine.human_policy``) reacts ``--reaction``
+ticks late and overlooks a share of bombs (``--miss-rate``), so games end.
+Candidates come from a grid::
+
+    python tune.py --grid speed_per_level=2,2.5,3 spawn_min=4,6,8 --games 50
+
+or from random search over ``SEARCH_SPACE``::
+
+    python tune.py --random 40 --games 50 --out report.json
+
+Kind weights are tuned with a ``weight_`` prefix, e.g. ``weight_bomb=10,17,25``.
+The report lists survival time, score distribution and level reached for
+every candidate, plus how many simulated frames per second each worker ran.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import engine
+
+# Each entry builds a fresh policy for one game from the player limits
+POLICIES = {
+    "human":  engine.human_policy,
+    "greedy": lambda reaction_ticks, miss_rate: engine.greedy_policy,
+    "random": lambda reaction_ticks, miss_rate: engine.random_policy,
+}
+
+# Ranges for --random; ints stay ints
+SEARCH_SPACE = {
+    "base_speed":       (3.0, 8.0),
+    "speed_per_level":  (1.0, 4.0),
+    "spawn_start":      (18, 36),
+    "spawn_per_level":  (1, 3),
+    "spawn_min":        (3, 10),
+    "points_per_level": (10, 40),
+    "weight_bomb":      (5, 35),
+}
+
+
+def make_difficulty(params):
+    diff = engine.DEFAULT_DIFFICULTY
+    fields  = {k: v for k, v in params.items() if not k.startswith("weight_")}
+    weights = {k[len("weight_"):]: v for k, v in params.items() if k.startswith("weight_")}
+    unknown = set(weights) - set(engine.KINDS)
+    if unknown:
+        raise ValueError(f"unknown object kind(s): {', '.join(sorted(unknown))}")
+    return engine.with_weights(diff._replace(**fields), **weights)
+
+
+def play_game(job):
+    # Runs in a worker process
+    params, seed, (policy, reaction_ticks, miss_rate), max_ticks, size = job
+    start = time.perf_counter()
+    player = POLICIES[policy](reaction_ticks, miss_rate)
+    state = engine.run_headless(*size, seed=seed, policy=player,
+                                max_frames=max_ticks, difficulty=make_difficulty(params))
+    elapsed = time.perf_counter() - start
+    return dict(params=params, seed=seed, ticks=state.frame, score=state.score,
+                level=state.level, survived=not state.game_over,
+                worker=os.getpid(), seconds=elapsed)
+
+
+def grid_candidates(specs):
+    axes = []
+    for spec in specs:
+        name, eq, values = spec.partition("=")
+        if not name or not eq or not values:
+            raise ValueError(f"bad grid spec {spec!r}, expected NAME=V1,V2")
+        try:
+            axes.append([(name, _number(v)) for v in values.split(",")])
+        except ValueError:
+            raise ValueError(f"bad grid spec {spec!r}, values must be numbers") from None
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+def random_candidates(count, rng):
+    out = []
+    for _ in range(count):
+        params = {}
+        for name, (lo, hi) in SEARCH_SPACE.items():
+            params[name] = rng.randint(lo, hi) if isinstance(lo, int) else round(rng.uniform(lo, hi), 2)
+        out.append(params)
+    return out
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def summarize(results):
+    by_params = {}
+    for r in results:
+        by_params.setdefault(json.dumps(r["params"], sort_keys=True), []).append(r)
+
+    candidates = []
+    for key, games in by_params.items():
+        scores   = [g["score"] for g in games]
+        survival = [g["ticks"] / engine.SIM_HZ for g in games]
+        candidates.append(dict(
+            params=json.loads(key),
+            games=len(games),
+            survival_s_mean=statistics.fmean(survival),
+            survival_s_median=statistics.median(survival),
+            timeouts=sum(g["survived"] for g in games),
+            score_mean=statistics.fmean(scores),
+            score_p10=_percentile(scores, 10),
+            score_median=statistics.median(scores),
+            score_p90=_percentile(scores, 90),
+            level_mean=statistics.fmean(g["level"] + 1 for g in games),
+        ))
+
+    workers = {}
+    for r in results:
+        w = workers.setdefault(r["worker"], dict(games=0, ticks=0, seconds=0.0))
+        w["games"] += 1
+        w["ticks"] += r["ticks"]
+        w["seconds"] += r["seconds"]
+    for w in workers.values():
+        w["fps"] = w["ticks"] / w["seconds"] if w["seconds"] else 0.0
+
+    return dict(candidates=candidates, workers=workers)
+
+
+def print_report(report, target):
+    rows = sorted(report["candidates"], key=lambda c: abs(c["survival_s_median"] - target))
+    print(f"{'survival s (mean/med)':>22} {'score p10/med/p90':>20} {'level':>6} {'t/o':>4}  params")
+    for c in rows:
+        params = " ".join(f"{k}={v}" for k, v in c["params"].items()) or "(defaults)"
+        print(f"{c['survival_s_mean']:>11.1f}/{c['survival_s_median']:<10.1f}"
+              f"{c['score_p10']:>8.0f}/{c['score_median']:.0f}/{c['score_p90']:<7.0f}"
+              f"{c['level_mean']:>6.1f} {c['timeouts']:>4}  {params}")
+    print()
+    for pid, w in sorted(report["workers"].items()):
+        print(f"worker {pid}: {w['games']} games, {w['fps']:,.0f} frames/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the difficulty curve with headless games.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--grid", nargs="+", metavar="NAME=V1,V2",
+                        help="parameter grid; every combination is a candidate")
+    source.add_argument("--random", type=int, metavar="N",
+                        help="N candidates sampled from SEARCH_SPACE")
+    parser.add_argument("--games", type=int, default=20, help="games per candidate")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="human",
+                        help="scripted player; greedy has perfect reactions and rarely dies")
+    parser.add_argument("--reaction", type=int, default=engine.REACTION_TICKS, metavar="TICKS",
+                        help="human player's reaction delay in simulation ticks")
+    parser.add_argument("--miss-rate", type=float, default=engine.MISS_RATE, metavar="P",
+                        help="chance the human player overlooks a bomb")
+    parser.add_argument("--max-minutes", type=float, default=10,
+                        help="game time after which a game counts as survived")
+    parser.add_argument("--size", default="1280x720", help="playfield WxH")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, default=180,
+                        help="median survival (s) the report is sorted towards")
+    parser.add_argument("--out", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.grid:
+        try:
+            candidates = grid_candidates(args.grid)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.random:
+        candidates = random_candidates(args.random, rng)
+    else:
+        candidates = [{}]
+    for params in candidates:
+        try:
+            make_difficulty(params)  # fail fast on typos, not in a worker
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.reaction < 0:
+        parser.error("--reaction must be >= 0")
+    if not 0 <= args.miss_rate <= 1:
+        parser.error("--miss-rate must be between 0 and 1")
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    max_ticks = int(args.max_minutes * 60 * engine.SIM_HZ)
+    # Same seeds for every candidate, so they are compared on the same games
+    seeds = [rng.randrange(2**63) for _ in range(args.games)]
+    player = (args.policy, args.reaction, args.miss_rate)
+    jobs  = [(params, seed, player, max_ticks, size)
+             for params in candidates for seed in seeds]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        chunk   = max(1, len(jobs) // (args.workers * 8))
+        results = list(pool.imap_unordered(play_game, jobs, chunksize=chunk))
+    elapsed = time.perf_counter() - start
+
+    report = summarize(results)
+    report["wall_seconds"] = elapsed
+    print(f"{len(jobs)} games, {len(candidates)} candidates, {args.workers} workers, {elapsed:.1f}s\n")
+    print_report(report, args.target)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()